@@ -1,5 +1,143 @@
 from collections import deque  # Importa deque para colas eficientes (BFS, búsquedas bidireccionales)
 import heapq  # Importa heapq para manejar colas de prioridad (Greedy, A*)
+import itertools  # Importa itertools para generar contadores de desempate en los montículos
+import multiprocessing as mp  # Importa multiprocessing para la búsqueda A* paralela (HDA*)
+import os  # Importa os para conocer el número de núcleos disponibles
+import queue  # Importa queue para la excepción Empty de las colas entre procesos
+import time  # Importa time para el sondeo de terminación del coordinador
+import zlib  # Importa zlib para un hash estable entre procesos (crc32)
+
+class _SMANode:
+    """
+    Nodo del árbol de búsqueda de SMA*.
+    Guarda su coste g, su valor f (que puede actualizarse al respaldar valores de sus hijos),
+    los sucesores aún no generados (o ya olvidados) y los hijos que siguen en memoria.
+    """
+    __slots__ = ('state', 'parent', 'g', 'f', 'depth', 'pending', 'children',
+                 'forgotten', 'in_open', 'version')
+
+    def __init__(self, state, parent, g, f, depth, pending):
+        self.state = state          # Nodo del grafo que representa
+        self.parent = parent        # Nodo padre en el árbol de búsqueda (None para la raíz)
+        self.g = g                  # Coste acumulado desde el inicio
+        self.f = f                  # Valor f(n), respaldado desde los hijos cuando procede
+        self.depth = depth          # Profundidad en el árbol
+        self.pending = pending      # Aristas (vecino, peso) de sucesores aún no generados
+        self.children = set()       # Hijos actualmente en memoria
+        self.forgotten = {}         # {estado: (peso, f)} de los hijos olvidados al liberar memoria
+        self.in_open = False        # Indica si el nodo está en la lista abierta
+        self.version = 0            # Invalida entradas antiguas en los montículos
+
+def _hda_owner(state, num_workers):
+    """
+    Proceso propietario de un estado en HDA*.
+    Usa crc32 en lugar de hash() porque el hash de cadenas cambia entre procesos.
+    """
+    return zlib.crc32(repr(state).encode()) % num_workers
+
+
+def _hda_star_worker(wid, num_workers, adj_list, heuristic, start, goal,
+                     inboxes, replies, incumbent, sent, received, idle, batch_size):
+    """
+    Proceso trabajador de HDA* (Hash Distributed A*).
+    Solo expande los estados que le pertenecen según `_hda_owner`; los sucesores ajenos
+    se envían en lotes (vecino, g, padre) a la cola del propietario. La mejor solución
+    conocida (`incumbent`) es compartida y poda todo nodo con f >= incumbent.
+    """
+    inf = float('inf')
+    inbox = inboxes[wid]
+    g_scores = {}   # Mejor g conocido para los estados propios
+    parents = {}    # Padre de cada estado propio (para reconstruir el camino al final)
+    open_set = []   # Lista abierta local (f, g, desempate, nodo)
+    counter = itertools.count()  # Desempate estable: los estados nunca se comparan entre sí
+    outbox = [[] for _ in range(num_workers)]  # Mensajes pendientes por destinatario
+
+    def h(v):
+        # El objetivo siempre tiene h = 0; los estados sin estimación cuentan como 0 (admisible)
+        return 0 if v == goal else heuristic.get(v, 0)
+
+    def relax(v, g, parent):
+        if g < g_scores.get(v, inf):
+            g_scores[v] = g
+            parents[v] = parent
+            if v == goal:
+                # Nueva mejor solución: se publica para que todos poden con ella
+                with incumbent.get_lock():
+                    if g < incumbent.value:
+                        incumbent.value = g
+            else:
+                heapq.heappush(open_set, (g + h(v), g, next(counter), v))
+
+    def receive(batch):
+        idle[wid] = 0                  # Primero se marca activo y después se cuenta el mensaje
+        received[wid] += len(batch)
+        for v, g, parent in batch:
+            relax(v, g, parent)
+
+    def flush():
+        for owner, batch in enumerate(outbox):
+            if batch:
+                sent[wid] += len(batch)  # Se cuenta antes de enviar para la detección de terminación
+                inboxes[owner].put(batch)
+                outbox[owner] = []
+
+    if _hda_owner(start, num_workers) == wid:
+        relax(start, 0, None)
+
+    expansions = 0
+    searching = True
+    while searching:
+        # Procesa todos los mensajes recibidos sin bloquear
+        while True:
+            try:
+                msg = inbox.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(msg, tuple):
+                searching = False    # ('done',): el coordinador detectó la terminación
+                break
+            receive(msg)
+        if not searching:
+            break
+
+        bound = incumbent.value
+        # Descarta entradas obsoletas del montículo
+        while open_set and open_set[0][1] > g_scores[open_set[0][3]]:
+            heapq.heappop(open_set)
+
+        if open_set and open_set[0][0] < bound:
+            f, g, _, u = heapq.heappop(open_set)
+            for v, w in adj_list.get(u, []):
+                tentative_g = g + w
+                if tentative_g + h(v) >= bound:
+                    continue  # No puede mejorar la mejor solución conocida
+                owner = _hda_owner(v, num_workers)
+                if owner == wid:
+                    relax(v, tentative_g, u)
+                else:
+                    outbox[owner].append((v, tentative_g, u))
+            expansions += 1
+            if expansions % batch_size == 0:
+                flush()
+        else:
+            # Sin trabajo útil: envía lo pendiente, se declara inactivo y espera mensajes
+            flush()
+            idle[wid] = 1
+            try:
+                msg = inbox.get(timeout=0.01)
+            except queue.Empty:
+                continue
+            if isinstance(msg, tuple):
+                break
+            receive(msg)
+
+    # Fase de reconstrucción: responde (padre, g) a las consultas hasta recibir None
+    while True:
+        msg = inbox.get()
+        if msg is None:
+            break
+        replies.put((parents.get(msg[1]), g_scores.get(msg[1])))
+
 
 class Graph:
     """
@@ -170,6 +308,256 @@ class Graph:
 
         return None  # Si no hay camino
 
+    def sma_star_search(self, start, goal, heuristic, max_nodes=1000):
+        """
+        Búsqueda SMA* (Simplified Memory-bounded A*).
+        Como A*, pero nunca guarda más de `max_nodes` nodos en memoria: cuando se llena,
+        elimina la hoja de peor f (la menos profunda en caso de empate) y respalda su
+        valor f en el padre, que la regenerará si vuelve a ser la opción más prometedora.
+        Los sucesores dominados por otro nodo en memoria con menor o igual g se podan.
+        Con memoria suficiente devuelve el mismo coste óptimo que A*; con poca memoria
+        tarda más en lugar de agotarla.
+        Devuelve (camino, coste), o None si no hay camino alcanzable con esa memoria.
+        """
+        if max_nodes < 2:
+            raise ValueError("max_nodes debe ser al menos 2")
+
+        inf = float('inf')
+        max_depth = max_nodes - 1  # Un camino más largo no cabe en memoria
+        counter = itertools.count()  # Desempate estable en los montículos
+        open_heap = []   # Mínimo (f, -profundidad): el nodo más prometedor y más profundo
+        leaf_heap = []   # Máximo (f, -profundidad): la peor hoja y menos profunda
+
+        def successors(state, parent):
+            # Sucesores de `state` excluyendo los ancestros, para no generar ciclos
+            ancestors = {state}
+            node = parent
+            while node is not None:
+                ancestors.add(node.state)
+                node = node.parent
+            return [(v, w) for v, w in self.adj_list.get(state, []) if v not in ancestors]
+
+        def push(node):
+            # Inserta (o reinserta con su f actual) un nodo en la lista abierta
+            node.in_open = True
+            node.version += 1
+            seq = next(counter)
+            heapq.heappush(open_heap, (node.f, -node.depth, seq, node, node.version))
+            heapq.heappush(leaf_heap, (-node.f, node.depth, seq, node, node.version))
+
+        def remove_from_open(node):
+            node.in_open = False
+            node.version += 1
+
+        def compact():
+            # Elimina las entradas obsoletas para que los montículos no crezcan sin límite
+            open_heap[:] = [e for e in open_heap if e[3].in_open and e[3].version == e[4]]
+            leaf_heap[:] = [e for e in leaf_heap if e[3].in_open and e[3].version == e[4]]
+            heapq.heapify(open_heap)
+            heapq.heapify(leaf_heap)
+
+        def backup(node):
+            # Cuando todos los sucesores de `node` se han generado alguna vez, su f es el
+            # mínimo entre los hijos en memoria y los valores respaldados de los olvidados
+            while node is not None and not node.pending:
+                new_f = min(min((c.f for c in node.children), default=inf),
+                            min((f for _, f in node.forgotten.values()), default=inf))
+                if new_f == node.f:
+                    break
+                node.f = new_f
+                if node.in_open:
+                    push(node)
+                node = node.parent
+
+        def drop_worst_leaf(protected):
+            # Olvida la hoja de mayor f (y menor profundidad) de la lista abierta
+            skipped = []
+            victim = None
+            while leaf_heap:
+                entry = heapq.heappop(leaf_heap)
+                node = entry[3]
+                if not (node.in_open and node.version == entry[4]):
+                    continue  # Entrada obsoleta
+                if node.children or node.parent is None or node is protected:
+                    skipped.append(entry)  # No es una hoja eliminable ahora mismo
+                    continue
+                victim = node
+                break
+            for entry in skipped:
+                heapq.heappush(leaf_heap, entry)
+            if victim is None:
+                return False
+
+            parent = victim.parent
+            remove_from_open(victim)
+            if in_memory.get(victim.state) is victim:
+                del in_memory[victim.state]
+            parent.children.discard(victim)
+            # El padre recuerda el f del hijo olvidado y podrá regenerarlo más tarde
+            parent.forgotten[victim.state] = (victim.g - parent.g, victim.f)
+            if not parent.in_open:
+                push(parent)
+            return True
+
+        root = _SMANode(start, None, 0, heuristic.get(start, inf), 0, successors(start, None))
+        push(root)
+        in_memory = {start: root}  # Mejor nodo en memoria para cada estado (poda de duplicados)
+        used = 1  # Nodos actualmente en memoria
+
+        while open_heap:
+            f, _, _, n, version = open_heap[0]
+            if not (n.in_open and n.version == version):
+                heapq.heappop(open_heap)  # Entrada obsoleta
+                continue
+            if f == inf:
+                return None  # Ningún camino cabe en la memoria disponible
+
+            if n.state == goal:
+                # Reconstrucción del camino siguiendo los padres
+                path, node = [], n
+                while node is not None:
+                    path.append(node.state)
+                    node = node.parent
+                return path[::-1], n.g
+
+            if n.pending:
+                # Genera un único sucesor nuevo cada vez (el de menor coste de arista)
+                idx = min(range(len(n.pending)), key=lambda i: n.pending[i][1])
+                v, w = n.pending.pop(idx)
+                backed_f = 0
+            elif n.forgotten:
+                # Regenera el hijo olvidado con mejor valor respaldado
+                v = min(n.forgotten, key=lambda s: n.forgotten[s][1])
+                w, backed_f = n.forgotten.pop(v)
+            else:
+                # Sin sucesores: callejón sin salida. Se queda en la lista abierta con f
+                # infinito para ser la primera hoja olvidada cuando falte memoria.
+                n.f = inf
+                push(n)
+                backup(n.parent)
+                continue
+
+            g = n.g + w
+            known = in_memory.get(v)
+            if known is not None and known.g <= g:
+                # Ya hay en memoria un camino igual o mejor hasta `v`: este sucesor está dominado
+                if not n.pending and not n.forgotten and n.children:
+                    remove_from_open(n)
+                backup(n)
+                continue
+
+            depth = n.depth + 1
+            if v != goal and depth >= max_depth:
+                child_f = inf  # No hay memoria para seguir profundizando por aquí
+            else:
+                # Pathmax: f nunca decrece a lo largo del camino
+                child_f = max(n.f, g + heuristic.get(v, inf), backed_f)
+            child = _SMANode(v, n, g, child_f, depth, successors(v, n))
+            if not child.pending and v != goal:
+                child.f = inf  # Sin sucesores: nunca llegará al objetivo
+
+            if used >= max_nodes:
+                if drop_worst_leaf(protected=n):
+                    used -= 1
+                else:
+                    return None  # No queda ninguna hoja que se pueda olvidar
+
+            n.children.add(child)
+            push(child)
+            in_memory[v] = child
+            used += 1
+
+            if not n.pending and not n.forgotten:
+                remove_from_open(n)  # Todos sus sucesores están en memoria
+            backup(n)
+
+            if len(open_heap) > 4 * max_nodes:
+                compact()
+
+        return None  # Si no hay camino
+
+    def parallel_a_star_search(self, start, goal, heuristic, num_workers=None, batch_size=64):
+        """
+        Búsqueda A* paralela al estilo HDA* (Hash Distributed A*).
+        Cada estado pertenece a un proceso según un hash; cada proceso mantiene su propia
+        lista abierta y envía los sucesores ajenos a la cola de su propietario.
+        El coordinador detecta la terminación cuando todos los procesos están inactivos y
+        el número de mensajes enviados coincide con el de recibidos en dos sondeos
+        consecutivos; como nadie expande nodos con f >= mejor coste conocido, el coste
+        devuelto es óptimo si la heurística es admisible (los estados sin estimación
+        cuentan como h = 0).
+        Devuelve (camino, coste), o None si no hay camino.
+        Si algún proceso falla, detiene a los demás y lanza RuntimeError.
+        """
+        num_workers = num_workers or os.cpu_count() or 1
+        inf = float('inf')
+
+        inboxes = [mp.Queue() for _ in range(num_workers)]  # Una cola de entrada por proceso
+        replies = mp.Queue()                                # Respuestas de la reconstrucción
+        incumbent = mp.Value('d', inf)                      # Mejor coste encontrado (compartido)
+        sent = mp.Array('q', num_workers, lock=False)       # Mensajes enviados por proceso
+        received = mp.Array('q', num_workers, lock=False)   # Mensajes recibidos por proceso
+        idle = mp.Array('b', num_workers, lock=False)       # 1 si el proceso no tiene trabajo
+
+        workers = [
+            mp.Process(target=_hda_star_worker,
+                       args=(wid, num_workers, self.adj_list, heuristic, start, goal,
+                             inboxes, replies, incumbent, sent, received, idle, batch_size),
+                       daemon=True)
+            for wid in range(num_workers)
+        ]
+        for w in workers:
+            w.start()
+
+        def check_workers():
+            # Un proceso que termina antes de recibir None ha fallado: se detiene al resto
+            for wid, w in enumerate(workers):
+                if w.exitcode is not None:
+                    for other in workers:
+                        if other.exitcode is None:
+                            other.terminate()
+                    raise RuntimeError(f"El proceso {wid} de HDA* terminó con código de salida {w.exitcode}")
+
+        try:
+            # Detección de terminación: todos inactivos y sin mensajes en tránsito, dos veces seguidas
+            previous = None
+            while True:
+                time.sleep(0.002)
+                check_workers()
+                total_sent, total_received = sum(sent), sum(received)
+                if total_sent != total_received or not all(idle):
+                    previous = None
+                    continue
+                if previous == total_sent:
+                    break
+                previous = total_sent
+
+            for inbox in inboxes:
+                inbox.put(('done',))
+
+            if incumbent.value == inf:
+                return None  # Si no hay camino
+
+            # Reconstrucción del camino preguntando a cada propietario por el padre
+            path, node, cost = [goal], goal, None
+            while node != start:
+                inboxes[_hda_owner(node, num_workers)].put(('parent', node))
+                while True:
+                    try:
+                        node, g = replies.get(timeout=0.1)
+                        break
+                    except queue.Empty:
+                        check_workers()
+                if cost is None:
+                    cost = g  # g del objetivo, con el tipo original de los pesos
+                path.append(node)
+            return path[::-1], cost if cost is not None else 0
+        finally:
+            for inbox in inboxes:
+                inbox.put(None)
+            for w in workers:
+                w.join()
+
     def a0_search(self, start, goal):
         """
         Búsqueda A* sin heurística (equivalente a Uniform Cost Search o Dijkstra).
@@ -210,6 +598,12 @@ if __name__ == "__main__":
     # Búsqueda A* sin heurística (A0 / Uniform Cost)
     res_a0 = g.a0_search(start, goal)
 
+    # Búsqueda SMA* con memoria limitada a 4 nodos
+    res_sma = g.sma_star_search(start, goal, heuristic, max_nodes=4)
+
+    # Búsqueda A* paralela (HDA*) con 2 procesos
+    res_hda = g.parallel_a_star_search(start, goal, heuristic, num_workers=2)
+
     # Resultados
     if res_astar:
         path, cost = res_astar
@@ -217,6 +611,18 @@ if __name__ == "__main__":
     else:
         print("A*: Sin solución")
 
+    if res_sma:
+        path_sma, cost_sma = res_sma
+        print(f"SMA* (4 nodos) → Camino: {path_sma}, Coste: {cost_sma}")
+    else:
+        print("SMA*: Sin solución")
+
+    if res_hda:
+        path_hda, cost_hda = res_hda
+        print(f"HDA* (2 procesos) → Camino: {path_hda}, Coste: {cost_hda}")
+    else:
+        print("HDA*: Sin solución")
+
     if res_a0:
         path0, cost0 = res_a0
         print(f"A0 (UCS) → Camino: {path0}, Coste: {cost0}")
@@ -1,16 +1,23 @@
 import random  # Importa el módulo random para generar el estado inicial aleatorio
+import multiprocessing as mp  # Importa multiprocessing para ejecutar reinicios en paralelo
+import numpy as np  # Importa numpy para el protocolo de evaluación por lotes
 
-def hill_climbing(objective, neighbors, initial_state, max_iterations=1000):
+def hill_climbing(objective, neighbors, initial_state, max_iterations=1000, batch=False):
     """
     Algoritmo de Hill Climbing (ascenso por colinas):
     - objective: función objetivo que se quiere maximizar.
     - neighbors: función que genera los vecinos de un estado dado.
     - initial_state: el estado desde el que se inicia la búsqueda.
     - max_iterations: tope de iteraciones para evitar bucles infinitos.
+    - batch: si es True, `objective` recibe todos los vecinos como un array de NumPy
+      y devuelve un vector con sus valores, en lugar de evaluarse vecino a vecino.
     Retorna el mejor estado encontrado junto con su valor.
     """
     current = initial_state                      # Estado actual comienza desde el inicial
-    current_value = objective(current)           # Evalúa el valor del estado actual
+    if batch:
+        current_value = objective(np.asarray([current]))[0]  # Evalúa el estado actual como lote de uno
+    else:
+        current_value = objective(current)       # Evalúa el valor del estado actual
 
     for i in range(max_iterations):              # Bucle de iteraciones controlado por el máximo
         nbrs = neighbors(current)                # Genera la lista de vecinos del estado actual
@@ -18,12 +25,22 @@ def hill_climbing(objective, neighbors, initial_state, max_iterations=1000):
         best_neighbor = None                     # Inicializa el mejor vecino
         best_value = current_value               # El mejor valor empieza siendo el actual
 
-        # Itera sobre los vecinos para encontrar el de mayor valor
-        for n in nbrs:
-            val = objective(n)                   # Evalúa el valor del vecino
-            if val > best_value:                 # Si mejora el valor actual, actualiza mejor vecino
-                best_value = val
-                best_neighbor = n
+        if batch:
+            # Evalúa todos los vecinos en una sola llamada vectorizada
+            if len(nbrs):
+                candidates = np.asarray(nbrs)
+                scores = np.asarray(objective(candidates))
+                idx = int(np.argmax(scores))     # Vecino con mayor valor
+                if scores[idx] > best_value:
+                    best_value = scores[idx]
+                    best_neighbor = nbrs[idx]
+        else:
+            # Itera sobre los vecinos para encontrar el de mayor valor
+            for n in nbrs:
+                val = objective(n)               # Evalúa el valor del vecino
+                if val > best_value:             # Si mejora el valor actual, actualiza mejor vecino
+                    best_value = val
+                    best_neighbor = n
 
         if best_neighbor is None:                # Si no hay mejora, se alcanzó un máximo local
             break
@@ -33,16 +50,108 @@ def hill_climbing(objective, neighbors, initial_state, max_iterations=1000):
 
     return current, current_value                # Retorna el mejor estado encontrado
 
-# BLOQUE PRINCIPAL
-if __name__ == "__main__":
-    # Función objetivo: f(x) = -(x-3)^2 + 10 → tiene un máximo en x=3
-    def f(x):
-        return -(x - 3)**2 + 10
+def _cached_value(objective, state, cache):
+    """Evalúa `objective(state)` una sola vez por estado, guardando el resultado en `cache`."""
+    if state in cache:
+        return cache[state]
+    value = cache[state] = objective(state)
+    return value
+
+def first_improvement_hill_climbing(objective, neighbors, initial_state, max_iterations=1000, cache=None):
+    """
+    Hill Climbing de primera mejora (first-choice):
+    en lugar de evaluar todos los vecinos, se mueve al primero que mejora el valor actual.
+    - neighbors: puede devolver un generador; solo se consume hasta encontrar una mejora.
+    - cache: diccionario {estado: valor} para no reevaluar estados ya vistos; puede
+      compartirse entre llamadas. Los estados deben ser hashables.
+    Retorna el mejor estado encontrado junto con su valor.
+    """
+    if cache is None:
+        cache = {}                               # Memo local para esta ejecución
+    current = initial_state
+    current_value = _cached_value(objective, current, cache)
+
+    for i in range(max_iterations):
+        for n in neighbors(current):             # Consume los vecinos de forma perezosa
+            val = _cached_value(objective, n, cache)
+            if val > current_value:              # Primera mejora: se mueve sin mirar el resto
+                current, current_value = n, val
+                break
+        else:
+            break                                # Ningún vecino mejora: máximo local
+
+    return current, current_value
+
+def stochastic_hill_climbing(objective, neighbors, initial_state, max_iterations=1000,
+                             accept_prob=0.5, cache=None, rng=None):
+    """
+    Hill Climbing estocástico con vecinos perezosos:
+    recorre los vecinos y acepta cada uno que mejora con probabilidad `accept_prob`,
+    de modo que el movimiento elegido varía entre ejecuciones sin evaluar todo el vecindario.
+    Si se agotan los vecinos sin aceptar ninguno, se mueve al mejor de los que mejoraban.
+    - cache: diccionario {estado: valor} compartible entre llamadas.
+    - rng: instancia de random.Random para resultados reproducibles.
+    Retorna el mejor estado encontrado junto con su valor.
+    """
+    if cache is None:
+        cache = {}
+    rng = rng or random
+    current = initial_state
+    current_value = _cached_value(objective, current, cache)
+
+    for i in range(max_iterations):
+        best_neighbor = None                     # Mejor vecino que mejora visto hasta ahora
+        best_value = current_value
+        for n in neighbors(current):
+            val = _cached_value(objective, n, cache)
+            if val > current_value:
+                if rng.random() < accept_prob:   # Aceptación aleatoria: se detiene aquí
+                    best_neighbor, best_value = n, val
+                    break
+                if val > best_value:
+                    best_neighbor, best_value = n, val
+
+        if best_neighbor is None:                # Ningún vecino mejora: máximo local
+            break
+
+        current = best_neighbor
+        current_value = best_value
+
+    return current, current_value
+
+def random_restart_hill_climbing(objective, neighbors, sample_initial, restarts=10,
+                                 max_iterations=1000, batch=False, processes=None):
+    """
+    Hill Climbing con reinicios aleatorios en paralelo:
+    - sample_initial: función sin argumentos que devuelve un estado inicial aleatorio.
+    - restarts: número de ascensos independientes a ejecutar.
+    - processes: número de procesos del pool (None usa todos los núcleos; 1 ejecuta en serie).
+    El resto de parámetros son los de `hill_climbing`. `objective` y `neighbors` deben
+    poder serializarse (funciones definidas a nivel de módulo) para enviarse a los procesos.
+    Retorna el mejor estado encontrado entre todos los ascensos junto con su valor.
+    """
+    # Los estados iniciales se muestrean en el proceso principal, así `sample_initial` no viaja al pool
+    tasks = [(objective, neighbors, sample_initial(), max_iterations, batch)
+             for _ in range(restarts)]
+
+    if processes == 1:
+        results = [hill_climbing(*task) for task in tasks]  # Ejecución en serie
+    else:
+        with mp.Pool(processes) as pool:
+            results = pool.starmap(hill_climbing, tasks)   # Un ascenso independiente por tarea
 
-    # Función de vecinos: genera dos vecinos (x-1 y x+1)
-    def gen_neighbors(x):
-        return [x - 1, x + 1]
+    return max(results, key=lambda r: r[1])  # El ascenso con mayor valor objetivo
 
+# Función objetivo: f(x) = -(x-3)^2 + 10 → tiene un máximo en x=3
+def f(x):
+    return -(x - 3)**2 + 10
+
+# Función de vecinos: genera dos vecinos (x-1 y x+1)
+def gen_neighbors(x):
+    return [x - 1, x + 1]
+
+# BLOQUE PRINCIPAL
+if __name__ == "__main__":
     # Estado inicial aleatorio entre -10 y 10
     init = random.randint(-10, 10)
 
@@ -52,3 +161,21 @@ if __name__ == "__main__":
     # Muestra los resultados
     print(f"Estado inicial: {init}")
     print(f"Mejor estado encontrado: {best_state} con valor {best_val}")
+
+    # Reinicios aleatorios en paralelo; `f` también acepta arrays, así que sirve como objetivo por lotes
+    best_state, best_val = random_restart_hill_climbing(
+        f, gen_neighbors, lambda: random.randint(-100, 100),
+        restarts=8, max_iterations=500, batch=True
+    )
+    print(f"Mejor estado con 8 reinicios en paralelo: {best_state} con valor {best_val}")
+
+    # Variantes perezosas: los vecinos se generan uno a uno y se comparte la caché de valores
+    def lazy_neighbors(x):
+        yield x - 1
+        yield x + 1
+
+    values = {}
+    best_state, best_val = first_improvement_hill_climbing(f, lazy_neighbors, init, cache=values)
+    print(f"Primera mejora: {best_state} con valor {best_val}")
+    best_state, best_val = stochastic_hill_climbing(f, lazy_neighbors, init, cache=values)
+    print(f"Estocástico: {best_state} con valor {best_val} ({len(values)} estados evaluados)")
@@ -1,6 +1,8 @@
 import random                       # (No se usa en este código, pero sirve para futuras extensiones)
 from collections import deque       # Importa deque para manejar la lista tabú con tamaño fijo
 import heapq                        # (No se usa aquí directamente, útil en otras búsquedas como A*)
+import time                         # Importa time para limitar la búsqueda por presupuesto de tiempo
+import numpy as np                  # Importa numpy para la matriz de conflictos de TabuCol
 
 class Graph:
     def __init__(self):
@@ -53,6 +55,223 @@ def tabu_search_graph(graph, start, goal, max_iterations=100, tabu_size=5):
     # Retorna el mejor camino y su costo total, o (None, None) si no se encontró camino
     return best_path, best_cost if best_path else (None, None)
 
+def _initial_path(graph, start, goal):
+    """
+    Camino inicial para la búsqueda tabú: el de menos aristas, obtenido con BFS.
+    Retorna None si `goal` no es alcanzable desde `start`.
+    """
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        u = queue.popleft()
+        if u == goal:
+            path = []
+            while u is not None:
+                path.append(u)
+                u = parents[u]
+            return path[::-1]
+        for v, _ in graph.edges.get(u, []):
+            if v not in parents:
+                parents[v] = u
+                queue.append(v)
+    return None
+
+def tabu_search_paths(graph, start, goal, time_budget=1.0, max_iterations=10000, tabu_tenure=7):
+    """
+    Búsqueda Tabú en el espacio de soluciones: cada estado es un camino completo de `start` a `goal`.
+    En cada iteración se evalúan movimientos de edición de la ruta y se aplica el mejor no tabú,
+    aunque empeore, hasta agotar `time_budget` segundos o `max_iterations` iteraciones.
+    Movimientos (todos mantienen un camino válido y sin ciclos):
+    - atajo: conecta path[i] con path[j] (j > i + 1) directamente, eliminando los nodos intermedios.
+    - desvío: sustituye la arista (path[i], path[i+1]) por path[i] → x → path[i+1].
+    - sustitución: cambia el nodo path[i] por x, con aristas path[i-1] → x → path[i+1].
+    Atributos tabú: un nodo eliminado no puede volver a entrar, y uno añadido no puede salir,
+    durante `tabu_tenure` iteraciones; se guardan en un diccionario {atributo: iteración de expiración},
+    así que comprobarlos es O(1). Criterio de aspiración: un movimiento tabú se permite si mejora
+    el mejor coste encontrado. El coste de cada movimiento se evalúa de forma incremental (delta)
+    con las aristas afectadas, sin recalcular el camino completo.
+    Retorna (mejor_camino, mejor_coste), o (None, None) si no hay camino.
+    """
+    path = _initial_path(graph, start, goal)
+    if path is None:
+        return None, None
+
+    # Pesos de las aristas en un diccionario de diccionarios para consultas O(1)
+    weights = {}
+    for u, nbrs in graph.edges.items():
+        for v, c in nbrs:
+            if c < weights.setdefault(u, {}).get(v, float('inf')):
+                weights[u][v] = c
+
+    cost = sum(weights[u][v] for u, v in zip(path, path[1:]))
+    best_path, best_cost = list(path), cost
+    tabu_until = {}  # {('add' | 'drop', nodo): iteración en la que deja de ser tabú}
+    deadline = time.perf_counter() + time_budget
+
+    for it in range(max_iterations):
+        if time.perf_counter() >= deadline:
+            break
+
+        pos = {node: i for i, node in enumerate(path)}  # Posición de cada nodo: pertenencia O(1)
+        prefix = [0]                                     # prefix[k] = coste de path[0..k]
+        for u, v in zip(path, path[1:]):
+            prefix.append(prefix[-1] + weights[u][v])
+        best_move = None                                 # (delta, i, j, nodos_insertados)
+
+        def consider(delta, i, j, inserted):
+            # Comprueba el estado tabú del movimiento y se queda con el de menor delta
+            nonlocal best_move
+            if best_move is not None and delta >= best_move[0]:
+                return
+            is_tabu = any(tabu_until.get(('add', x), -1) > it for x in inserted) or \
+                any(tabu_until.get(('drop', path[k]), -1) > it for k in range(i + 1, j))
+            if is_tabu and cost + delta >= best_cost:
+                return  # Tabú y no cumple el criterio de aspiración
+            best_move = (delta, i, j, inserted)
+
+        for i in range(len(path) - 1):
+            u, nxt = path[i], path[i + 1]
+            w_next = prefix[i + 1] - prefix[i]  # Coste de la arista (path[i], path[i+1])
+            for x, c_ux in weights.get(u, {}).items():
+                j = pos.get(x)
+                if j is not None:
+                    if j > i + 1:
+                        # Atajo: elimina path[i+1..j-1]
+                        consider(c_ux - (prefix[j] - prefix[i]), i, j, ())
+                    continue
+                c_x_next = weights.get(x, {}).get(nxt)
+                if c_x_next is not None:
+                    # Desvío por x entre path[i] y path[i+1]
+                    consider(c_ux + c_x_next - w_next, i, i + 1, (x,))
+                if i + 2 < len(path):
+                    c_x_after = weights.get(x, {}).get(path[i + 2])
+                    if c_x_after is not None:
+                        # Sustitución de path[i+1] por x
+                        old = prefix[i + 2] - prefix[i]
+                        consider(c_ux + c_x_after - old, i, i + 2, (x,))
+
+        if best_move is None:
+            break  # Todos los movimientos son tabú (o no hay ninguno)
+
+        delta, i, j, inserted = best_move
+        removed_nodes = path[i + 1:j]
+        path[i + 1:j] = inserted              # Aplica el movimiento sobre el camino
+        cost += delta
+        for x in removed_nodes:
+            tabu_until[('add', x)] = it + tabu_tenure + 1   # No puede volver a entrar enseguida
+        for x in inserted:
+            tabu_until[('drop', x)] = it + tabu_tenure + 1  # No puede salir enseguida
+
+        if cost < best_cost:
+            best_path, best_cost = list(path), cost
+
+    return best_path, best_cost
+
+def tabucol(variables, domains, neighbors, max_iterations=100000, seed=None):
+    """
+    TabuCol: búsqueda tabú para coloreado de grafos expresado como CSP
+    (mismas entradas `variables`, `domains` y `neighbors` que la clase CSP; la restricción
+    implícita es que dos vecinos no pueden tener el mismo valor). Basta con listar cada
+    arista en un sentido.
+    Mantiene una matriz de conflictos `gamma` (variable × color) en NumPy, donde gamma[v, c]
+    es el número de vecinos de v con color c; así, el cambio de conflictos al mover v a c es
+    gamma[v, c] - gamma[v, color[v]], en O(1). Solo se consideran las variables en conflicto.
+    Mover v desde el color c deja (v, c) tabú durante 0.6 * conflictos + aleatorio(0..9)
+    iteraciones, salvo que el movimiento mejore el mejor número de conflictos (aspiración).
+    Retorna un diccionario {variable: valor} sin conflictos, o None si no lo encuentra.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(variables)
+    index = {v: i for i, v in enumerate(variables)}          # Variable → fila de la matriz
+    colors = list(dict.fromkeys(c for v in variables for c in domains[v]))
+    color_index = {c: j for j, c in enumerate(colors)}       # Valor → columna de la matriz
+    k = len(colors)
+    if n == 0:
+        return {}
+
+    # Colores permitidos por el dominio de cada variable
+    allowed = np.zeros((n, k), dtype=bool)
+    for v in variables:
+        allowed[index[v], [color_index[c] for c in domains[v]]] = True
+    if not allowed.any(axis=1).all():
+        return None  # Alguna variable tiene el dominio vacío
+
+    # Grafo simétrico y sin aristas repetidas: `neighbors` puede listar cada arista en un solo
+    # sentido (como admite la clase CSP), y gamma cuenta cada conflicto desde ambos extremos.
+    adj = [dict() for _ in range(n)]           # dict como conjunto ordenado (reproducible)
+    for v in variables:
+        for u in neighbors.get(v, []):
+            if u != v:
+                adj[index[v]][index[u]] = None
+                adj[index[u]][index[v]] = None
+
+    # Adyacencia en formato CSR: nbr_idx[indptr[i]:indptr[i+1]] son los vecinos de i
+    nbr_lists = [list(a) for a in adj]
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(lst) for lst in nbr_lists])
+    nbr_idx = np.fromiter((u for lst in nbr_lists for u in lst), dtype=np.int64, count=indptr[-1])
+
+    # Asignación inicial voraz: cada variable toma el color permitido con menos conflictos
+    # entre los vecinos ya coloreados (desempate aleatorio). Parte de muchos menos conflictos
+    # que una asignación aleatoria, lo que acorta mucho la búsqueda en grafos grandes.
+    gamma = np.zeros((n, k), dtype=np.int64)   # gamma[v, c] = número de vecinos de v coloreados con c
+    color = np.empty(n, dtype=np.int64)
+    noise = rng.random((n, k))                 # Desempates aleatorios precalculados
+    for i in rng.permutation(n):
+        score = np.where(allowed[i], gamma[i] + noise[i], np.inf)
+        c = int(np.argmin(score))
+        color[i] = c
+        np.add.at(gamma, (nbr_idx[indptr[i]:indptr[i + 1]], c), 1)
+
+    rows = np.arange(n)
+    own = gamma[rows, color]                   # own[v] = vecinos de v con su mismo color
+    conflicts = int(own.sum()) // 2            # Cada conflicto se cuenta desde ambos extremos
+    best_conflicts = conflicts
+    best_color = color.copy()
+    tabu = np.zeros((n, k), dtype=np.int64)          # tabu[v, c]: iteración hasta la que (v, c) es tabú
+
+    for it in range(max_iterations):
+        if conflicts == 0:
+            break
+
+        # Variables en conflicto y delta de cada posible cambio de color
+        conflicted = np.flatnonzero(own > 0)
+        delta = gamma[conflicted] - own[conflicted][:, None]
+        valid = allowed[conflicted].copy()
+        valid[np.arange(len(conflicted)), color[conflicted]] = False
+        # Un movimiento tabú solo es válido si cumple el criterio de aspiración
+        not_tabu = tabu[conflicted] <= it
+        aspiration = conflicts + delta < best_conflicts
+        valid &= not_tabu | aspiration
+        if not valid.any():
+            continue  # Todo es tabú en esta iteración: se espera a que expire la tenencia
+
+        masked = np.where(valid, delta, np.iinfo(np.int64).max)
+        best_delta = masked.min()
+        # Desempate aleatorio entre los mejores movimientos
+        choices = np.flatnonzero(masked.ravel() == best_delta)
+        r, new = divmod(int(rng.choice(choices)), k)
+        v = conflicted[r]
+        old = color[v]
+
+        # Actualización incremental de gamma en los vecinos de v
+        nb = nbr_idx[indptr[v]:indptr[v + 1]]
+        np.add.at(gamma, (nb, old), -1)
+        np.add.at(gamma, (nb, new), 1)
+        np.add.at(own, nb, (color[nb] == new).astype(np.int64) - (color[nb] == old))
+        color[v] = new
+        own[v] = gamma[v, new]
+        conflicts += int(best_delta)
+        tabu[v, old] = it + int(0.6 * conflicts) + int(rng.integers(0, 10)) + 1
+
+        if conflicts < best_conflicts:
+            best_conflicts = conflicts
+            best_color = color.copy()
+
+    if best_conflicts > 0:
+        return None
+    return {v: colors[best_color[index[v]]] for v in variables}
+
 # Ejemplo de uso
 if __name__ == "__main__":
     # Crea el grafo y agrega aristas con sus respectivos costos
@@ -77,3 +296,25 @@ if __name__ == "__main__":
         print(f"Camino encontrado: {path} con costo total: {total_cost}")
     else:
         print("No se encontró un camino.")
+
+    # Búsqueda tabú sobre caminos completos con 0.1 s de presupuesto
+    path, total_cost = tabu_search_paths(g, start_node, goal_node, time_budget=0.1, tabu_tenure=3)
+    if path:
+        print(f"Tabú sobre caminos completos: {path} con costo total: {total_cost}")
+    else:
+        print("No se encontró un camino.")
+
+    # TabuCol sobre el coloreado del mapa de Australia (mismo formato que la clase CSP)
+    regions = ['WA', 'NT', 'SA', 'Q', 'NSW', 'V', 'T']
+    region_domains = {r: ['red', 'green', 'blue'] for r in regions}
+    region_neighbors = {
+        'WA': ['NT', 'SA'],
+        'NT': ['WA', 'SA', 'Q'],
+        'SA': ['WA', 'NT', 'Q', 'NSW', 'V'],
+        'Q': ['NT', 'SA', 'NSW'],
+        'NSW': ['Q', 'SA', 'V'],
+        'V': ['SA', 'NSW'],
+        'T': []
+    }
+    coloring = tabucol(regions, region_domains, region_neighbors, seed=0)
+    print(f"Coloreado TabuCol: {coloring}")
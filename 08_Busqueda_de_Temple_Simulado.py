@@ -1,5 +1,7 @@
 import math                # Importa la biblioteca `math` para funciones matemáticas como `exp`.
+from collections import deque  # Importa deque para la BFS inversa de alcanzabilidad.
 import random              # Importa la biblioteca `random` para generar números aleatorios.
+import multiprocessing as mp  # Importa multiprocessing para ejecutar varias cadenas en paralelo.
 
 class Graph:
     """
@@ -9,6 +11,7 @@ class Graph:
     def __init__(self):
         # Inicializa un diccionario de listas de adyacencia para almacenar el grafo.
         self.adj_list = {}  # { nodo: [(vecino, peso), ...] }
+        self._reaching = {}  # Caché { objetivo: conjunto de nodos que pueden alcanzarlo }
 
     def add_edge(self, u, v, weight=1):
         """
@@ -17,32 +20,61 @@ class Graph:
         """
         # Agrega un vecino `v` con su peso `weight` a la lista de adyacencia del nodo `u`.
         self.adj_list.setdefault(u, []).append((v, weight))
+        self._reaching.clear()  # Las aristas nuevas invalidan la caché de alcanzabilidad.
 
-    def random_path(self, start, goal):
+    def nodes_reaching(self, goal):
         """
-        Genera un camino aleatorio de start a goal mediante random walk.
+        Devuelve el conjunto de nodos desde los que se puede llegar a `goal` (incluido él mismo).
+        Se calcula una vez por objetivo con una BFS sobre las aristas invertidas y se guarda en caché.
         """
+        if goal not in self._reaching:
+            reverse = {}  # { nodo: [predecesores] }
+            for u, nbrs in self.adj_list.items():
+                for v, _ in nbrs:
+                    reverse.setdefault(v, []).append(u)
+            reach = {goal}
+            queue = deque([goal])
+            while queue:
+                v = queue.popleft()
+                for u in reverse.get(v, []):
+                    if u not in reach:
+                        reach.add(u)
+                        queue.append(u)
+            self._reaching[goal] = reach
+        return self._reaching[goal]
+
+    def random_path(self, start, goal, rng=random):
+        """
+        Genera un camino aleatorio sin ciclos de start a goal mediante random walk.
+        Cada paso solo elige vecinos desde los que aún se puede llegar a `goal`; si todos
+        ya están en el camino, retrocede un paso en lugar de reiniciar el paseo completo.
+        `rng` es el generador usado (por defecto, el módulo `random`).
+        Devuelve None si `goal` no es alcanzable desde `start`.
+        """
+        reach = self.nodes_reaching(goal)
+        if start not in reach:
+            return None  # Objetivo inalcanzable: se detecta antes de empezar.
+
         path = [start]          # El camino comienza con el nodo de inicio.
-        current = start         # Establece el nodo actual como el de inicio.
-        visited = {start}       # Crea un conjunto de nodos visitados para evitar ciclos.
+        visited = {start}       # Nodos ya usados (en el camino o descartados como callejón).
 
         # Continúa el recorrido hasta llegar al nodo objetivo.
-        while current != goal:
-            # Obtiene los vecinos del nodo actual que no han sido visitados.
-            neighbors = [v for v, _ in self.adj_list.get(current, []) if v not in visited]
+        while path[-1] != goal:
+            # Vecinos no visitados que todavía pueden llegar al objetivo.
+            neighbors = [v for v, _ in self.adj_list.get(path[-1], [])
+                         if v in reach and v not in visited]
 
             if not neighbors:
-                # Si no hay vecinos no visitados, reinicia el camino.
-                path = [start]
-                current = start
-                visited = {start}
+                # Todos los caminos útiles pasan por nodos ya usados: retrocede un paso.
+                path.pop()
+                if not path:
+                    return None
                 continue
 
             # Elige aleatoriamente un vecino para continuar el recorrido.
-            next_node = random.choice(neighbors)
+            next_node = rng.choice(neighbors)
             path.append(next_node)  # Añade el vecino al camino.
             visited.add(next_node)  # Marca el vecino como visitado.
-            current = next_node     # Avanza al siguiente nodo.
 
         return path  # Devuelve el camino completo desde start hasta goal.
 
@@ -60,10 +92,78 @@ class Graph:
                     break
         return cost  # Retorna el coste total del camino.
 
+    def edge_weights(self):
+        """
+        Devuelve {u: {v: peso}} para consultar el peso de una arista en O(1).
+        Con aristas repetidas se conserva la primera, igual que en `path_cost`.
+        """
+        weights = {}
+        for u, nbrs in self.adj_list.items():
+            out = weights.setdefault(u, {})
+            for v, w in nbrs:
+                out.setdefault(v, w)
+        return weights
+
+def _propose_reroute(path, pos, successors, weights, max_detour, rng):
+    """
+    Propone un movimiento de re-enrutado sobre `path` sin modificarlo.
+    Desde un nodo path[i] se da un paseo aleatorio de hasta `max_detour` aristas, sin pasar
+    por nodos anteriores del camino, hasta tocar un nodo posterior path[j].
+    Devuelve (i, j, paseo, delta), donde sustituir path[i..j] por el paseo da un camino válido
+    y delta es la diferencia de coste calculada solo con las aristas afectadas (O(Δ)),
+    o None si el paseo no reconecta con el camino (movimiento nulo).
+    """
+    i = rng.randrange(len(path) - 1)
+    node = path[i]
+    walk = [node]
+    walk_cost = 0
+    j = None
+    for _ in range(max_detour):
+        nbrs = successors.get(node)
+        if not nbrs:
+            return None                 # Callejón sin salida.
+        v = rng.choice(nbrs)
+        k = pos.get(v)
+        if v in walk or (k is not None and k <= i):
+            return None                 # Formaría un ciclo.
+        walk.append(v)
+        walk_cost += weights[node][v]
+        if k is not None:
+            j = k                       # Reconecta con el camino en path[j].
+            break
+        node = v
+
+    if j is None or (j == i + 1 and len(walk) == 2):
+        return None                     # No reconecta, o es la misma arista.
+
+    # Delta incremental: coste del paseo menos el del tramo path[i..j] que sustituye.
+    old_cost = 0
+    for k in range(i, j):
+        old_cost += weights[path[k]][path[k + 1]]
+    return i, j, walk, walk_cost - old_cost
+
+def _apply_reroute(path, pos, i, j, walk):
+    """
+    Sustituye path[i..j] por `walk` en el sitio y actualiza `pos` solo donde cambia:
+    se olvidan los nodos interiores quitados, se numeran los del paseo y, si la longitud
+    del camino varía, se desplazan las posiciones de la cola path[j..]. El coste es
+    O(Δ) más la longitud de la cola cuando cambia la longitud (la misma que mueve el slice).
+    """
+    for node in path[i + 1:j]:
+        del pos[node]
+    shift = len(walk) - 1 - (j - i)
+    path[i:j + 1] = walk
+    for k in range(i + 1, i + len(walk) - 1):
+        pos[path[k]] = k
+    if shift:
+        for k in range(i + len(walk) - 1, len(path)):
+            pos[path[k]] = k
+
 def simulated_annealing_graph(graph, start, goal,
                                initial_temp=100.0,
                                cooling_rate=0.95,
-                               max_iterations=1000):
+                               max_iterations=1000,
+                               max_detour=4):
     """
     Búsqueda de Temple Simulado en un grafo para aproximar un camino de mínimo coste.
     - graph: instancia de Graph.
@@ -71,10 +171,15 @@ def simulated_annealing_graph(graph, start, goal,
     - initial_temp: temperatura inicial.
     - cooling_rate: tasa de enfriamiento (0 < rate < 1).
     - max_iterations: número máximo de iteraciones.
+    - max_detour: longitud máxima (en aristas) del subcamino alternativo de cada movimiento.
+    Los vecinos se generan con `_propose_reroute`, así que todo vecino es un camino válido y
+    sin ciclos; el camino solo se modifica (en el sitio) cuando se acepta el movimiento.
     Devuelve (mejor_camino, coste).
     """
     # Genera un camino aleatorio inicial desde el nodo de inicio hasta el nodo objetivo.
     current_path = graph.random_path(start, goal)
+    if current_path is None:
+        return None, None  # El objetivo no es alcanzable.
     current_cost = graph.path_cost(current_path)  # Calcula el coste del camino inicial.
     
     best_path = list(current_path)  # Establece el camino inicial como el mejor hasta ahora.
@@ -82,31 +187,27 @@ def simulated_annealing_graph(graph, start, goal,
     
     temp = initial_temp            # Establece la temperatura inicial.
 
+    weights = graph.edge_weights()                              # Pesos de arista en O(1).
+    successors = {u: list(out) for u, out in weights.items()}   # Vecinos para elegir al azar.
+    pos = {node: k for k, node in enumerate(current_path)}      # Posición de cada nodo del camino.
+
     # Itera por un número máximo de veces, o hasta que la temperatura sea suficientemente baja.
-    for i in range(max_iterations):
-        if temp <= 1e-3:  # Si la temperatura es muy baja, termina el algoritmo.
+    for it in range(max_iterations):
+        if temp <= 1e-3 or len(current_path) < 2:  # Temperatura muy baja (o start == goal): termina.
             break
 
-        # Genera un vecino: permuta dos nodos intermedios del camino.
-        path = list(current_path)  # Copia el camino actual para modificarlo.
-        if len(path) > 2:
-            i1 = random.randint(1, len(path)-2)  # Selecciona aleatoriamente un índice para el primer nodo.
-            i2 = random.randint(1, len(path)-2)  # Selecciona aleatoriamente otro índice para el segundo nodo.
-            path[i1], path[i2] = path[i2], path[i1]  # Permuta los dos nodos seleccionados.
-
-        new_cost = graph.path_cost(path)  # Calcula el coste del nuevo camino.
-
-        delta = new_cost - current_cost  # Calcula la diferencia de coste entre el nuevo camino y el actual.
-        
-        # Si el nuevo camino tiene un coste menor, o se acepta de manera probabilística.
-        if delta < 0 or random.random() < math.exp(-delta / temp):
-            current_path = path  # Acepta el nuevo camino.
-            current_cost = new_cost  # Actualiza el coste actual.
-            
-            # Si el nuevo coste es el mejor encontrado, lo guarda.
-            if new_cost < best_cost:
-                best_path = list(path)
-                best_cost = new_cost
+        move = _propose_reroute(current_path, pos, successors, weights, max_detour, random)
+        if move is not None:
+            i, j, walk, delta = move
+            # Si el nuevo camino tiene un coste menor, o se acepta de manera probabilística.
+            if delta < 0 or random.random() < math.exp(-delta / temp):
+                _apply_reroute(current_path, pos, i, j, walk)  # Acepta el movimiento en el sitio.
+                current_cost += delta            # Actualiza el coste actual.
+
+                # Si el nuevo coste es el mejor encontrado, lo guarda.
+                if current_cost < best_cost:
+                    best_path = list(current_path)
+                    best_cost = current_cost
 
         # Enfría la temperatura de acuerdo con la tasa de enfriamiento.
         temp *= cooling_rate
@@ -114,6 +215,123 @@ def simulated_annealing_graph(graph, start, goal,
     # Retorna el mejor camino encontrado y su coste total.
     return best_path, best_cost
 
+# Estado de cada proceso del pool de temple paralelo (se envía una vez con el inicializador).
+_PT_WEIGHTS = None
+_PT_SUCCESSORS = None
+
+def _init_tempering_worker(weights, successors):
+    """Guarda el grafo en el proceso trabajador para no reenviarlo en cada ronda."""
+    global _PT_WEIGHTS, _PT_SUCCESSORS
+    _PT_WEIGHTS = weights
+    _PT_SUCCESSORS = successors
+
+def _tempering_round(path, cost, temp, steps, max_detour, seed):
+    """
+    Ejecuta `steps` iteraciones de Metropolis a temperatura fija sobre una cadena.
+    Devuelve (camino, coste, mejor_camino, mejor_coste, aceptados, propuestos).
+    """
+    rng = random.Random(seed)
+    pos = {node: k for k, node in enumerate(path)}
+    best_path, best_cost = list(path), cost
+    accepted = proposed = 0
+    for _ in range(steps):
+        if len(path) < 2:
+            break
+        move = _propose_reroute(path, pos, _PT_SUCCESSORS, _PT_WEIGHTS, max_detour, rng)
+        if move is None:
+            continue
+        i, j, walk, delta = move
+        proposed += 1
+        if delta < 0 or rng.random() < math.exp(-delta / temp):
+            _apply_reroute(path, pos, i, j, walk)
+            cost += delta
+            accepted += 1
+            if cost < best_cost:
+                best_path, best_cost = list(path), cost
+    return path, cost, best_path, best_cost, accepted, proposed
+
+def parallel_tempering_graph(graph, start, goal,
+                             temperatures=(0.5, 1.0, 2.0, 4.0, 8.0),
+                             rounds=100,
+                             steps_per_round=1000,
+                             max_detour=4,
+                             processes=None,
+                             seed=None):
+    """
+    Temple paralelo (replica exchange): K cadenas, una por temperatura, avanzan
+    `steps_per_round` iteraciones cada ronda en un pool de procesos; después se intenta
+    intercambiar los estados de cadenas de temperaturas vecinas con probabilidad
+    min(1, exp((E_k - E_k+1) * (1/T_k - 1/T_k+1))).
+    - temperatures: temperatura de cada cadena.
+    - processes: procesos del pool (None usa todos los núcleos; 1 ejecuta en serie).
+    - seed: semilla base para que cada cadena y ronda sea reproducible.
+    Devuelve (mejor_camino, coste, estadísticas), donde estadísticas es una lista con un
+    diccionario por temperatura: movimientos propuestos y aceptados, tasa de aceptación y
+    tasa de intercambio con la cadena siguiente.
+    """
+    temperatures = sorted(temperatures)
+    K = len(temperatures)
+    weights = graph.edge_weights()
+    successors = {u: list(out) for u, out in weights.items()}
+    master = random.Random(seed)
+
+    # Cada cadena parte de un camino aleatorio distinto, generado con `master` para que
+    # la semilla también fije los caminos iniciales.
+    paths = [graph.random_path(start, goal, master) for _ in range(K)]
+    if paths[0] is None:
+        return None, None, []  # El objetivo no es alcanzable.
+    costs = [graph.path_cost(p) for p in paths]
+    best_k = min(range(K), key=lambda k: costs[k])
+    best_path, best_cost = list(paths[best_k]), costs[best_k]
+
+    accepted = [0] * K
+    proposed = [0] * K
+    swaps_tried = [0] * K
+    swaps_done = [0] * K
+
+    if processes == 1:
+        _init_tempering_worker(weights, successors)
+        pool = None
+    else:
+        pool = mp.Pool(processes, initializer=_init_tempering_worker, initargs=(weights, successors))
+    try:
+        for r in range(rounds):
+            tasks = [(paths[k], costs[k], temperatures[k], steps_per_round, max_detour,
+                      master.getrandbits(64)) for k in range(K)]
+            if pool is None:
+                results = [_tempering_round(*task) for task in tasks]
+            else:
+                results = pool.starmap(_tempering_round, tasks)
+
+            for k, (path, cost, chain_best, chain_best_cost, acc, prop) in enumerate(results):
+                paths[k], costs[k] = path, cost
+                accepted[k] += acc
+                proposed[k] += prop
+                if chain_best_cost < best_cost:
+                    best_path, best_cost = chain_best, chain_best_cost
+
+            # Intercambios entre temperaturas vecinas (alternando pares e impares).
+            for k in range(r % 2, K - 1, 2):
+                swaps_tried[k] += 1
+                x = (costs[k] - costs[k + 1]) * (1 / temperatures[k] - 1 / temperatures[k + 1])
+                if x >= 0 or master.random() < math.exp(x):
+                    paths[k], paths[k + 1] = paths[k + 1], paths[k]
+                    costs[k], costs[k + 1] = costs[k + 1], costs[k]
+                    swaps_done[k] += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    stats = [{
+        'temperature': temperatures[k],
+        'proposed': proposed[k],
+        'accepted': accepted[k],
+        'acceptance_rate': accepted[k] / proposed[k] if proposed[k] else 0.0,
+        'swap_rate': swaps_done[k] / swaps_tried[k] if swaps_tried[k] else 0.0,
+    } for k in range(K)]
+    return best_path, best_cost, stats
+
 if __name__ == "__main__":
     # Ejemplo de uso: Crear un grafo ponderado y aplicar Temple Simulado.
     g = Graph()
@@ -139,3 +357,14 @@ if __name__ == "__main__":
     )
     # Imprime el mejor camino encontrado y su coste.
     print(f"Mejor camino aproximado: {best_path} con coste {best_cost}")
+
+    # Temple paralelo con 4 cadenas en un pool de procesos.
+    pt_path, pt_cost, pt_stats = parallel_tempering_graph(
+        g, start_node, goal_node,
+        temperatures=(0.5, 1.0, 2.0, 4.0),
+        rounds=20, steps_per_round=200, seed=0
+    )
+    print(f"Temple paralelo: {pt_path} con coste {pt_cost}")
+    for st in pt_stats:
+        print(f"  T={st['temperature']}: aceptación {st['acceptance_rate']:.2f}, "
+              f"intercambio {st['swap_rate']:.2f}")
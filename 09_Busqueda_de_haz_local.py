@@ -1,4 +1,10 @@
 from collections import deque  # Importa la clase deque, que se usa para gestionar colas de manera eficiente.
+import heapq  # Importa heapq para seleccionar los mejores candidatos sin ordenar la lista completa.
+from operator import itemgetter  # Importa itemgetter para comparar candidatos solo por su coste.
+import multiprocessing as mp  # Importa multiprocessing para expandir el haz en varios procesos.
+import os  # Importa os para construir las rutas de los ficheros mapeados en memoria.
+import tempfile  # Importa tempfile para guardar el grafo mapeado en memoria en un directorio temporal.
+import numpy as np  # Importa numpy para el grafo en formato CSR y la expansión vectorizada.
 
 class Graph:
     """
@@ -45,44 +51,246 @@ def local_beam_search_graph(graph, start, goal, beam_width, max_iterations=100):
     - beam_width: ancho del haz (número de caminos a mantener).
     - max_iterations: iteraciones máximas.
 
+    Los caminos no se copian: cada entrada del haz es un manejador (índice) a un almacén de
+    nodos con puntero al padre, y su coste se acumula de forma incremental. Los candidatos que
+    llegan al mismo nodo se deduplican quedándose con el más barato, y se descartan los que no
+    mejoran el coste con el que ese nodo ya entró en el haz (con costes no negativos esto también
+    evita los ciclos). El haz se elige con selección parcial (`heapq.nsmallest`) y los caminos
+    solo se reconstruyen al final.
+
     Retorna:
     - best_path: mejor camino encontrado (list de nodos) o None.
     - best_cost: coste del mejor camino o None.
     """
-    # Inicializa el haz con el camino inicial, que contiene solo el nodo de inicio.
-    beam = [[start]]
-    best_path = None  # Variable para almacenar el mejor camino encontrado.
-    best_cost = float('inf')  # Inicializa el mejor coste como infinito.
+    inf = float('inf')
+    nodes = [start]    # Almacén de entradas: manejador → nodo.
+    parents = [-1]     # Manejador → manejador del padre (-1 para la raíz).
+    beam = [(0, 0)]    # Haz actual: (coste, manejador).
+    best_g = {start: 0}  # Coste con el que cada nodo entró en el haz.
+    best_handle = None   # Manejador del mejor camino que termina en el objetivo.
+    best_cost = inf      # Inicializa el mejor coste como infinito.
 
     # Itera hasta el número máximo de iteraciones.
     for _ in range(max_iterations):
-        candidates = []  # Lista para almacenar los caminos candidatos junto con sus costes.
-
-        # Expande cada camino en el haz (expande todos los caminos actuales).
-        for path in beam:
-            last = path[-1]  # Obtiene el último nodo del camino actual.
-            # Itera sobre los vecinos del nodo `last`.
-            for neighbor, cost in graph.adj_list.get(last, []):
-                if neighbor not in path:  # Evita ciclos (el vecino no debe estar en el camino).
-                    new_path = path + [neighbor]  # Crea un nuevo camino agregando el vecino.
-                    c = graph.path_cost(new_path)  # Calcula el coste del nuevo camino.
-                    candidates.append((c, new_path))  # Agrega el nuevo camino y su coste a los candidatos.
+        candidates = {}  # nodo → (coste, nodo, manejador del padre), el más barato por nodo.
+
+        # Expande cada entrada del haz.
+        for cost, handle in beam:
+            for neighbor, w in graph.adj_list.get(nodes[handle], []):
+                c = cost + w  # Coste incremental, sin recorrer el camino.
+                if c >= best_g.get(neighbor, inf):
+                    continue  # Dominado por una entrada anterior del haz (incluye los ciclos).
+                prev = candidates.get(neighbor)
+                if prev is None or c < prev[0]:
+                    candidates[neighbor] = (c, neighbor, handle)
 
         if not candidates:
             break  # Si no hay más caminos válidos, termina la búsqueda.
 
-        # Ordena los caminos candidatos por coste de menor a mayor.
-        candidates.sort(key=lambda x: x[0])
-        # Mantiene solo los `beam_width` caminos más baratos.
-        beam = [path for cost, path in candidates[:beam_width]]
+        # Mantiene solo los `beam_width` candidatos más baratos (selección parcial).
+        selected = heapq.nsmallest(beam_width, candidates.values(), key=itemgetter(0))
+        beam = []
+        goal_handle = None
+        for c, node, parent in selected:
+            nodes.append(node)
+            parents.append(parent)
+            handle = len(nodes) - 1
+            best_g[node] = c
+            beam.append((c, handle))
+            if node == goal:
+                goal_handle = handle
+
+        # Actualiza el mejor camino global si algún candidato llega al objetivo.
+        goal_candidate = candidates.get(goal)
+        if goal_candidate is not None and goal_candidate[0] < best_cost:
+            if goal_handle is None:
+                # El objetivo no entró en el haz: se guarda igualmente su entrada.
+                nodes.append(goal)
+                parents.append(goal_candidate[2])
+                goal_handle = len(nodes) - 1
+            best_cost = goal_candidate[0]
+            best_handle = goal_handle
+
+    if best_handle is None:
+        return None, None
 
-        # Actualiza el mejor camino global si se encuentra un camino que termina en el objetivo.
-        for cost, path in candidates:
-            if path[-1] == goal and cost < best_cost:
-                best_cost = cost  # Actualiza el mejor coste.
-                best_path = path  # Actualiza el mejor camino.
+    # Reconstrucción del camino siguiendo los punteros al padre.
+    best_path = []
+    handle = best_handle
+    while handle != -1:
+        best_path.append(nodes[handle])
+        handle = parents[handle]
+    return best_path[::-1], best_cost  # Devuelve el mejor camino encontrado.
 
-    return best_path, best_cost if best_path is not None else (None, None)  # Devuelve el mejor camino encontrado.
+# Grafo CSR mapeado en memoria dentro de cada proceso trabajador (se abre una vez por proceso).
+_BEAM_GRAPH = None
+
+def _init_beam_worker(directory):
+    """Abre en modo solo lectura los arrays del grafo y de costes compartidos por el coordinador."""
+    global _BEAM_GRAPH
+    _BEAM_GRAPH = tuple(np.load(os.path.join(directory, name + '.npy'), mmap_mode='r')
+                        for name in ('indptr', 'indices', 'weights', 'best_g'))
+
+def _close_beam_worker():
+    """Suelta los mapas abiertos por `_init_beam_worker` (en modo serie, los del propio proceso)."""
+    global _BEAM_GRAPH
+    _BEAM_GRAPH = None
+
+def _expand_beam_shard(costs, nodes, handles, k, goal):
+    """
+    Expande un fragmento del haz de forma vectorizada y devuelve su top-k local.
+    - costs, nodes, handles: arrays con el coste, el nodo (índice entero) y el manejador de cada entrada.
+    Devuelve (costes, nodos, manejadores_padre) de los k mejores candidatos, deduplicados por nodo,
+    y (coste, manejador_padre) del mejor candidato que llega al objetivo, o None.
+    """
+    indptr, indices, weights, best_g = _BEAM_GRAPH
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = int(counts.sum())
+    empty = (costs[:0], nodes[:0], handles[:0])
+    if total == 0:
+        return empty, None
+
+    # Índices de todas las aristas salientes del fragmento, sin bucles de Python.
+    owner = np.repeat(np.arange(len(nodes)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    edges = starts[owner] + offsets
+    nbr = indices[edges]
+    c = costs[owner] + weights[edges]
+
+    # Descarta candidatos dominados por el coste con el que su nodo entró en el haz.
+    keep = c < best_g[nbr]
+    nbr, c, parent = nbr[keep], c[keep], handles[owner[keep]]
+    if len(nbr) == 0:
+        return empty, None
+
+    # Deduplicación por nodo: el más barato de cada uno.
+    order = np.lexsort((c, nbr))
+    nbr, c, parent = nbr[order], c[order], parent[order]
+    first = np.ones(len(nbr), dtype=bool)
+    first[1:] = nbr[1:] != nbr[:-1]
+    nbr, c, parent = nbr[first], c[first], parent[first]
+
+    at_goal = np.flatnonzero(nbr == goal)
+    goal_best = (c[at_goal[0]], parent[at_goal[0]]) if len(at_goal) else None
+
+    # Top-k local por selección parcial.
+    if len(c) > k:
+        top = np.argpartition(c, k - 1)[:k]
+        nbr, c, parent = nbr[top], c[top], parent[top]
+    return (c, nbr, parent), goal_best
+
+def parallel_local_beam_search_graph(graph, start, goal, beam_width, max_iterations=100, processes=None):
+    """
+    Búsqueda por Haz Local con la expansión repartida entre procesos, para haces muy anchos.
+    El grafo se convierte a formato CSR (indptr, indices, weights) y se guarda en ficheros que
+    cada proceso abre mapeados en memoria, así que no se copia. En cada iteración el haz se
+    divide en fragmentos; cada proceso devuelve su top-k local y el coordinador los fusiona
+    (deduplicando por nodo) para formar el siguiente haz. Mismas reglas de poda que
+    `local_beam_search_graph`.
+    - processes: número de procesos (None usa todos los núcleos; 1 expande en el propio proceso).
+    Retorna (mejor_camino, mejor_coste) o (None, None).
+    """
+    # Numeración entera de los nodos y grafo en formato CSR.
+    names = list(dict.fromkeys([start, goal] + list(graph.adj_list) +
+                               [v for nbrs in graph.adj_list.values() for v, _ in nbrs]))
+    ids = {name: i for i, name in enumerate(names)}
+    indptr = np.zeros(len(names) + 1, dtype=np.int64)
+    for name, nbrs in graph.adj_list.items():
+        indptr[ids[name] + 1] = len(nbrs)
+    np.cumsum(indptr, out=indptr)
+    edge_list = [None] * int(indptr[-1])
+    for name, nbrs in graph.adj_list.items():
+        base = int(indptr[ids[name]])
+        for offset, (v, w) in enumerate(nbrs):
+            edge_list[base + offset] = (ids[v], w)
+    indices = np.array([v for v, _ in edge_list], dtype=np.int64)
+    weights = np.array([w for _, w in edge_list]) if edge_list else np.zeros(0, dtype=np.int64)
+    goal_id = ids[goal]
+    processes = processes or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, arr in (('indptr', indptr), ('indices', indices), ('weights', weights)):
+            np.save(os.path.join(directory, name + '.npy'), arr)
+        # Coste con el que cada nodo entró en el haz: lo escribe el coordinador y lo leen los procesos.
+        best_g = np.lib.format.open_memmap(os.path.join(directory, 'best_g.npy'), mode='w+',
+                                           dtype=np.float64, shape=(len(names),))
+        best_g[:] = np.inf
+        best_g[ids[start]] = 0
+
+        if processes == 1:
+            _init_beam_worker(directory)
+            pool = None
+        else:
+            pool = mp.Pool(processes, initializer=_init_beam_worker, initargs=(directory,))
+
+        store_nodes = [np.array([ids[start]])]   # Almacén de entradas por bloques: manejador → nodo.
+        store_parents = [np.array([-1])]          # Manejador → manejador del padre.
+        stored = 1
+        beam = (np.zeros(1, dtype=weights.dtype), np.array([ids[start]]), np.array([0]))
+        best_cost, best_handle = np.inf, None
+        try:
+            for _ in range(max_iterations):
+                shards = [tuple(part[idx] for part in beam)
+                          for idx in np.array_split(np.arange(len(beam[0])), min(processes, len(beam[0])))]
+                tasks = [(c, n, h, beam_width, goal_id) for c, n, h in shards]
+                if pool is None:
+                    results = [_expand_beam_shard(*task) for task in tasks]
+                else:
+                    results = pool.starmap(_expand_beam_shard, tasks)
+
+                # Fusión de los top-k locales: deduplicación por nodo y selección parcial.
+                c = np.concatenate([r[0][0] for r in results])
+                n = np.concatenate([r[0][1] for r in results])
+                h = np.concatenate([r[0][2] for r in results])
+                if len(c) == 0:
+                    break  # Si no hay más caminos válidos, termina la búsqueda.
+                order = np.lexsort((c, n))
+                c, n, h = c[order], n[order], h[order]
+                first = np.ones(len(n), dtype=bool)
+                first[1:] = n[1:] != n[:-1]
+                c, n, h = c[first], n[first], h[first]
+                if len(c) > beam_width:
+                    top = np.argpartition(c, beam_width - 1)[:beam_width]
+                    c, n, h = c[top], n[top], h[top]
+
+                new_handles = np.arange(stored, stored + len(n))
+                store_nodes.append(n)
+                store_parents.append(h)
+                stored += len(n)
+                best_g[n] = c  # Visible para los procesos en la siguiente iteración.
+                beam = (c, n, new_handles)
+
+                # Mejor candidato que llega al objetivo entre todos los fragmentos.
+                goal_hits = [r[1] for r in results if r[1] is not None]
+                if goal_hits:
+                    goal_cost, goal_parent = min(goal_hits, key=itemgetter(0))
+                    if goal_cost < best_cost:
+                        best_cost = goal_cost
+                        store_nodes.append(np.array([goal_id]))
+                        store_parents.append(np.array([goal_parent]))
+                        best_handle = stored
+                        stored += 1
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+            else:
+                _close_beam_worker()  # No dejar el global apuntando al directorio borrado.
+            del best_g  # Cierra el mapa antes de borrar el directorio temporal.
+
+    if best_handle is None:
+        return None, None
+
+    # Reconstrucción del camino siguiendo los punteros al padre.
+    all_nodes = np.concatenate(store_nodes)
+    all_parents = np.concatenate(store_parents)
+    best_path = []
+    handle = best_handle
+    while handle != -1:
+        best_path.append(names[all_nodes[handle]])
+        handle = all_parents[handle]
+    return best_path[::-1], best_cost.item()
 
 if __name__ == "__main__":
     # Ejemplo de uso
@@ -112,3 +320,12 @@ if __name__ == "__main__":
         print(f"Mejor camino encontrado: {best_path} con coste: {best_cost}")
     else:
         print("No se encontró un camino al objetivo.")
+
+    # Misma búsqueda con la expansión del haz repartida en 2 procesos.
+    best_path, best_cost = parallel_local_beam_search_graph(
+        g, start_node, goal_node, beam_width, max_iterations=50, processes=2
+    )
+    if best_path:
+        print(f"Haz paralelo: {best_path} con coste: {best_cost}")
+    else:
+        print("Haz paralelo: no se encontró un camino al objetivo.")
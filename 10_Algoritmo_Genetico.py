@@ -1,4 +1,9 @@
 import random  # Importa el módulo random para generar números aleatorios.
+from collections import deque, OrderedDict  # deque para la BFS inversa; OrderedDict para la caché LRU.
+import numpy as np  # Importa numpy para evaluar la fitness de toda la población en un solo paso.
+import multiprocessing as mp  # Importa multiprocessing para el modelo de islas en paralelo.
+from multiprocessing.connection import wait  # Espera a que termine cualquiera de los procesos de las islas.
+import os  # Importa os para generar semillas cuando no se proporciona una.
 
 class Graph:
     """
@@ -9,6 +14,7 @@ class Graph:
         # Inicializa el grafo como un diccionario vacío. Las claves son los nodos
         # y los valores son listas de tuplas (vecino, coste).
         self.adj_list = {}  # { nodo: [(vecino, costo), ...] }
+        self._reaching = {}  # Caché { objetivo: conjunto de nodos que pueden alcanzarlo }
 
     def add_edge(self, u, v, cost=1):
         """
@@ -18,30 +24,57 @@ class Graph:
         # Agrega una arista dirigida de `u` hacia `v` con un coste asociado.
         # Si el nodo `u` no existe en el grafo, se inicializa como una lista vacía.
         self.adj_list.setdefault(u, []).append((v, cost))
+        self._reaching.clear()  # Las aristas nuevas invalidan la caché de alcanzabilidad.
+
+    def nodes_reaching(self, goal):
+        """
+        Devuelve el conjunto de nodos desde los que se puede llegar a `goal` (incluido él mismo).
+        Se calcula una vez por objetivo con una BFS sobre las aristas invertidas y se guarda en caché.
+        """
+        if goal not in self._reaching:
+            reverse = {}  # { nodo: [predecesores] }
+            for u, nbrs in self.adj_list.items():
+                for v, _ in nbrs:
+                    reverse.setdefault(v, []).append(u)
+            reach = {goal}
+            queue = deque([goal])
+            while queue:
+                v = queue.popleft()
+                for u in reverse.get(v, []):
+                    if u not in reach:
+                        reach.add(u)
+                        queue.append(u)
+            self._reaching[goal] = reach
+        return self._reaching[goal]
 
     def random_path(self, start, goal):
         """
         Genera un camino aleatorio de `start` a `goal` mediante random walk sin ciclos.
+        Solo se avanza hacia vecinos desde los que aún se puede llegar a `goal`; si todos
+        ya están usados, se retrocede un paso en lugar de reiniciar el camino.
+        Devuelve None si `goal` no es alcanzable desde `start`.
         """
+        reach = self.nodes_reaching(goal)  # Nodos que pueden llegar al objetivo.
+        if start not in reach:
+            return None  # Objetivo inalcanzable: se detecta antes de empezar.
+
         path = [start]  # El camino comienza con el nodo de inicio.
-        visited = {start}  # El conjunto de nodos visitados para evitar ciclos.
-        current = start  # Nodo actual de inicio.
+        visited = {start}  # Nodos usados (en el camino o descartados como callejón sin salida).
         
         # Repite hasta llegar al nodo objetivo.
-        while current != goal:
-            # Encuentra los vecinos que no han sido visitados.
-            nbrs = [v for v, _ in self.adj_list.get(current, []) if v not in visited]
+        while path[-1] != goal:
+            # Encuentra los vecinos no visitados que todavía pueden llegar al objetivo.
+            nbrs = [v for v, _ in self.adj_list.get(path[-1], []) if v in reach and v not in visited]
             if not nbrs:
-                # Si no hay vecinos no visitados, reinicia el camino.
-                path = [start]
-                visited = {start}
-                current = start
+                # Si no hay vecinos útiles, retrocede un paso.
+                path.pop()
+                if not path:
+                    return None
                 continue
             # Selecciona un vecino aleatorio entre los no visitados.
             next_node = random.choice(nbrs)
             path.append(next_node)  # Añade el nodo al camino.
             visited.add(next_node)  # Marca el nodo como visitado.
-            current = next_node  # Actualiza el nodo actual.
         
         return path  # Retorna el camino encontrado.
 
@@ -72,6 +105,60 @@ def fitness(path, graph):
     cost = graph.path_cost(path)  # Calcula el coste del camino.
     return 1.0 / (1 + cost)  # La fitness es inversamente proporcional al coste.
 
+class FitnessCache:
+    """
+    Caché LRU acotada de (coste, fitness) por camino, con evaluación por lotes.
+    Cada camino distinto se evalúa una sola vez mientras siga en la caché; los que faltan
+    se evalúan juntos: se buscan los pesos de todas sus aristas y los costes se obtienen
+    con una suma acumulada vectorizada por camino.
+    """
+    def __init__(self, graph, maxsize=10000):
+        self.maxsize = maxsize            # Número máximo de caminos guardados.
+        self._entries = OrderedDict()     # { tuple(camino): (coste, fitness) }, en orden de uso.
+        # Peso de cada arista (u, v); con aristas repetidas vale la primera, como en `path_cost`.
+        self._weights = {}
+        for u, nbrs in graph.adj_list.items():
+            for v, w in nbrs:
+                self._weights.setdefault((u, v), w)
+        self.hits = 0                     # Evaluaciones servidas desde la caché.
+        self.misses = 0                   # Caminos distintos que hubo que evaluar.
+
+    def evaluate(self, population):
+        """Devuelve (costes, fitness) de la población, en el mismo orden."""
+        keys = [tuple(p) for p in population]
+        missing = list(dict.fromkeys(k for k in keys if k not in self._entries))
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+
+        if missing:
+            # Pesos de todas las aristas de los caminos nuevos, concatenados.
+            lengths = np.array([len(k) - 1 for k in missing])
+            flat = np.array([self._weights.get(pair, 0) for k in missing for pair in zip(k, k[1:])])
+            # Cada camino en su propia fila, rellenada con ceros, y suma acumulada por filas:
+            # el mismo orden de sumas que `path_cost`, así que el coste coincide exactamente
+            # (las diferencias de una suma acumulada global arrastran el redondeo del lote).
+            rows = np.repeat(np.arange(len(missing)), lengths)
+            cols = np.arange(len(flat)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            padded = np.zeros((len(missing), max(int(lengths.max()), 1)),
+                              dtype=flat.dtype if len(flat) else np.int64)
+            padded[rows, cols] = flat
+            costs = np.cumsum(padded, axis=1)[:, -1]       # Coste de cada camino.
+            fits = 1.0 / (1 + costs)                       # Misma fórmula que `fitness`.
+            for k, c, f in zip(missing, costs.tolist(), fits.tolist()):
+                self._entries[k] = (c, f)
+
+        costs, fits = [], []
+        for k in keys:
+            c, f = self._entries[k]
+            self._entries.move_to_end(k)  # Marca el camino como usado recientemente.
+            costs.append(c)
+            fits.append(f)
+
+        # Expulsa los caminos usados hace más tiempo si se supera el tamaño máximo.
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return costs, fits
+
 def tournament_selection(pop, fits, k=3):
     """
     Selección por torneo: selecciona el mejor camino entre `k` candidatos aleatorios.
@@ -116,32 +203,37 @@ def mutate(path, graph, mutation_rate):
         # Selecciona un índice aleatorio dentro del camino para modificar el sufijo.
         idx = random.randint(1, len(path) - 2)
         # Genera un nuevo camino aleatorio desde el nodo seleccionado hasta el nodo final.
-        suffix = graph.random_path(path[idx], path[-1])[1:]
-        # Combina la parte inicial del camino con el nuevo sufijo generado.
+        suffix = graph.random_path(path[idx], path[-1])
+        # Combina la parte inicial del camino con el nuevo sufijo generado (que empieza en path[idx]).
         path = path[:idx] + suffix
     
     return path  # Devuelve el camino mutado.
 
 def genetic_algorithm_graph(graph, start, goal,
                              pop_size=20, generations=100,
-                             crossover_rate=0.8, mutation_rate=0.1):
+                             crossover_rate=0.8, mutation_rate=0.1,
+                             cache_size=10000):
     """
     Algoritmo Genético para encontrar un camino de bajo coste en un grafo.
+    La fitness se calcula con una `FitnessCache` de `cache_size` caminos, así que cada
+    individuo distinto se evalúa una sola vez y el coste se reutiliza para el mejor global.
     """
     # Inicializa la población generando caminos aleatorios.
     population = generate_initial_population(graph, start, goal, pop_size)
+    if not population or population[0] is None:
+        return None, None  # El objetivo no es alcanzable.
 
     best_path = None  # Inicializa la mejor solución encontrada.
     best_cost = float('inf')  # Inicializa el mejor coste como infinito.
+    cache = FitnessCache(graph, cache_size)  # Caché de costes y fitness por camino.
 
     # Ejecuta el algoritmo durante un número de generaciones.
     for gen in range(generations):
-        # Calcula la fitness de cada camino en la población.
-        fits = [fitness(p, graph) for p in population]
+        # Calcula el coste y la fitness de cada camino en la población (en lote y con caché).
+        costs, fits = cache.evaluate(population)
 
         # Actualiza la mejor solución global si se encuentra un mejor camino.
-        for p, f in zip(population, fits):
-            c = graph.path_cost(p)  # Calcula el coste del camino `p`.
+        for p, c in zip(population, costs):
             if c < best_cost:  # Si el coste es menor que el mejor coste encontrado.
                 best_cost = c  # Actualiza el mejor coste.
                 best_path = p[:]  # Actualiza el mejor camino.
@@ -167,6 +259,452 @@ def genetic_algorithm_graph(graph, start, goal,
 
     return best_path, best_cost  # Devuelve el mejor camino encontrado y su coste.
 
+# Modelo de islas: cada proceso evoluciona su propia subpoblación y cada cierto número de
+# generaciones envía sus mejores individuos a las islas vecinas según una topología.
+
+def island_topology(islands, topology='ring'):
+    """
+    Devuelve { isla: [islas destino de sus emigrantes] }.
+    - 'ring': cada isla envía a la siguiente (la última a la primera).
+    - 'bidirectional_ring': a la anterior y a la siguiente.
+    - 'fully_connected': a todas las demás.
+    También se acepta directamente un diccionario con la topología; se valida que cada
+    destino sea una isla distinta del origen y que no se repita.
+    """
+    if isinstance(topology, dict):
+        links = {}
+        for i in range(islands):
+            targets = list(topology.get(i, []))
+            for t in targets:
+                if not isinstance(t, int) or not 0 <= t < islands or t == i:
+                    raise ValueError(f"Destino de migración no válido para la isla {i}: {t!r}")
+            if len(set(targets)) != len(targets):
+                raise ValueError(f"Destinos de migración repetidos para la isla {i}: {targets}")
+            links[i] = targets
+        return links
+    if islands < 2:
+        return {i: [] for i in range(islands)}
+    if topology == 'ring':
+        return {i: [(i + 1) % islands] for i in range(islands)}
+    if topology == 'bidirectional_ring':
+        return {i: sorted({(i - 1) % islands, (i + 1) % islands}) for i in range(islands)}
+    if topology == 'fully_connected':
+        return {i: [j for j in range(islands) if j != i] for i in range(islands)}
+    raise ValueError(f"Topología desconocida: {topology}")
+
+def _loop_free(path):
+    """
+    Elimina los ciclos de `path` (el cruce puede repetir nodos): al volver a un nodo ya
+    visitado se descarta el tramo intermedio. El resultado es un camino simple con los
+    mismos extremos y, con costes no negativos, de coste menor o igual.
+    """
+    simple, pos = [], {}
+    for v in path:
+        if v in pos:
+            for u in simple[pos[v] + 1:]:
+                del pos[u]
+            del simple[pos[v] + 1:]
+        else:
+            pos[v] = len(simple)
+            simple.append(v)
+    return simple
+
+def _publish_best(path, cost, ids, best_cost, best_path, best_len):
+    """
+    Publica `path` como mejor global si `cost` lo mejora. `path` debe ser simple, así que
+    cabe siempre en `best_path` (un hueco por nodo). Retorna True si lo publicó.
+    """
+    with best_cost.get_lock():
+        if cost >= best_cost.value:
+            return False
+        best_cost.value = cost
+        best_path[:len(path)] = [ids[v] for v in path]
+        best_len.value = len(path)
+        return True
+
+def _island_worker(island, seed, graph, start, goal, pop_size, generations,
+                   crossover_rate, mutation_rate, migration_interval, migrants,
+                   targets, sources, inboxes, names, best_cost, best_path, best_len, timeout):
+    """
+    Evoluciona una isla con los operadores de `genetic_algorithm_graph`.
+    Cada `migration_interval` generaciones envía copias de sus `migrants` mejores caminos a
+    `targets` y sustituye sus peores individuos por los recibidos de `sources` (ordenados por
+    isla de origen, para que la ejecución sea reproducible). Si un origen no envía nada en
+    `timeout` segundos, la espera lanza `queue.Empty` y la isla termina con error.
+    El mejor global se publica sin ciclos en memoria compartida (`best_cost`, `best_path`,
+    `best_len`) bajo el cerrojo de `best_cost`.
+    """
+    random.seed(seed)  # Semilla propia de la isla: random_path y los operadores la usan.
+    ids = {name: i for i, name in enumerate(names)}
+    cache = FitnessCache(graph)
+    population = generate_initial_population(graph, start, goal, pop_size)
+    local_best = float('inf')
+
+    def publish(costs):
+        """Publica el mejor de la isla (sin ciclos) si mejora lo ya publicado por ella."""
+        nonlocal local_best
+        i = min(range(len(population)), key=lambda r: costs[r])
+        if costs[i] < local_best:
+            path = _loop_free(population[i])
+            cost = graph.path_cost(path)
+            if _publish_best(path, cost, ids, best_cost, best_path, best_len):
+                local_best = cost
+
+    for gen in range(generations):
+        costs, fits = cache.evaluate(population)
+        publish(costs)  # Publica el mejor de la isla si mejora el global.
+
+        # Migración síncrona: enviar a los destinos y esperar a todos los orígenes.
+        if migration_interval and (gen + 1) % migration_interval == 0 and (targets or sources):
+            ranked = sorted(range(len(population)), key=lambda r: costs[r])
+            emigrants = [list(population[r]) for r in ranked[:migrants]]
+            for t in targets:
+                inboxes[t].put((island, emigrants))
+            received = sorted((inboxes[island].get(timeout=timeout) for _ in sources),
+                              key=lambda m: m[0])
+            immigrants = [p for _, paths in received for p in paths]
+            # Los inmigrantes sustituyen a los peores individuos de la isla.
+            for r, p in zip(reversed(ranked), immigrants):
+                population[r] = p
+            costs, fits = cache.evaluate(population)
+
+        # Selección, cruce y mutación, igual que en `genetic_algorithm_graph`.
+        selected = tournament_selection(population, fits)
+        next_pop = []
+        while len(next_pop) < pop_size:
+            p1, p2 = random.sample(selected, 2)
+            if random.random() < crossover_rate:
+                c1, c2 = crossover(p1, p2)
+            else:
+                c1, c2 = p1[:], p2[:]
+            next_pop.extend([c1, c2])
+        population = [mutate(p, graph, mutation_rate) for p in next_pop[:pop_size]]
+
+    # Evalúa la última generación.
+    costs, _ = cache.evaluate(population)
+    publish(costs)
+
+def island_genetic_algorithm_graph(graph, start, goal,
+                                   islands=4, pop_size=20, generations=100,
+                                   crossover_rate=0.8, mutation_rate=0.1,
+                                   migration_interval=10, migrants=2,
+                                   topology='ring', seed=None, timeout=60):
+    """
+    Algoritmo Genético con modelo de islas: una subpoblación de `pop_size` caminos por proceso.
+    - migration_interval: cada cuántas generaciones se migra (0 desactiva la migración).
+    - migrants: número de mejores individuos que envía cada isla.
+    - topology: ver `island_topology`.
+    - seed: semilla base; la isla i usa seed + i, así cada isla es reproducible.
+    - timeout: segundos que una isla espera a sus inmigrantes antes de abandonar.
+    Retorna (mejor_camino, mejor_coste) del mejor global compartido entre procesos.
+    Lanza RuntimeError si alguna isla falla (las demás se detienen).
+    """
+    if graph.random_path(start, goal) is None:
+        return None, None  # El objetivo no es alcanzable.
+    if seed is None:
+        seed = int.from_bytes(os.urandom(4), 'little')
+
+    names = list(dict.fromkeys([start, goal] + list(graph.adj_list) +
+                               [v for nbrs in graph.adj_list.values() for v, _ in nbrs]))
+    links = island_topology(islands, topology)
+    sources = {i: [j for j in range(islands) if i in links[j]] for i in range(islands)}
+
+    inboxes = [mp.Queue() for _ in range(islands)]  # Cola de inmigrantes de cada isla.
+    # Mejor global en memoria compartida: coste, camino (ids de nodo) y longitud.
+    best_cost = mp.Value('d', float('inf'))
+    best_path = mp.Array('q', len(names), lock=False)
+    best_len = mp.Value('i', 0, lock=False)
+
+    workers = [
+        mp.Process(target=_island_worker,
+                   args=(i, seed + i, graph, start, goal, pop_size, generations,
+                         crossover_rate, mutation_rate, migration_interval, migrants,
+                         links[i], sources[i], inboxes, names, best_cost, best_path, best_len,
+                         timeout))
+        for i in range(islands)
+    ]
+    for w in workers:
+        w.start()
+    # Espera a las islas según van terminando; si una falla, detiene al resto.
+    pending = dict(enumerate(workers))
+    while pending:
+        wait([w.sentinel for w in pending.values()])
+        for i, w in list(pending.items()):
+            if w.exitcode is None:
+                continue
+            w.join()
+            del pending[i]
+            if w.exitcode != 0:
+                for other in pending.values():
+                    other.terminate()
+                    other.join()
+                raise RuntimeError(f"La isla {i} terminó con código de salida {w.exitcode}")
+
+    if best_len.value == 0:
+        return None, None
+    path = [names[v] for v in best_path[:best_len.value]]
+    return path, graph.path_cost(path)
+
+# Representación matricial: la población es una matriz de enteros (ids de nodo) rellenada con -1
+# y un vector de longitudes, de modo que selección, cruce y evaluación son operaciones de NumPy.
+
+PAD = -1  # Valor de relleno de la matriz de población.
+
+def encode_population(paths, ids):
+    """Convierte una lista de caminos en (matriz de ids rellenada con PAD, vector de longitudes)."""
+    lengths = np.array([len(p) for p in paths], dtype=np.int64)
+    matrix = np.full((len(paths), int(lengths.max(initial=1))), PAD, dtype=np.int64)
+    for r, p in enumerate(paths):
+        matrix[r, :len(p)] = [ids[v] for v in p]
+    return matrix, lengths
+
+def population_costs(matrix, lengths, edge_keys, edge_weights, n):
+    """
+    Coste de todos los caminos a la vez. Cada arista (u, v) se identifica con la clave u * n + v;
+    `edge_keys` está ordenado y `edge_weights` contiene el peso de cada clave.
+    """
+    if matrix.shape[1] < 2 or len(edge_keys) == 0:
+        return np.zeros(len(matrix), dtype=edge_weights.dtype)
+    keys = matrix[:, :-1] * n + matrix[:, 1:]
+    valid = np.arange(matrix.shape[1] - 1) < (lengths - 1)[:, None]   # Solo las aristas reales.
+    loc = np.minimum(np.searchsorted(edge_keys, keys), len(edge_keys) - 1)
+    found = valid & (edge_keys[loc] == keys)
+    return np.where(found, edge_weights[loc], 0).sum(axis=1)
+
+def tournament_selection_array(fits, k=3, rng=None):
+    """Selección por torneo vectorizada: devuelve los índices de los ganadores de len(fits) torneos."""
+    rng = rng or np.random.default_rng()
+    aspirants = rng.integers(0, len(fits), size=(len(fits), k))
+    return aspirants[np.arange(len(fits)), np.argmax(fits[aspirants], axis=1)]
+
+def roulette_selection_array(fits, rng=None):
+    """Selección por ruleta vectorizada (probabilidad proporcional a la fitness)."""
+    rng = rng or np.random.default_rng()
+    cumulative = np.cumsum(fits)
+    return np.searchsorted(cumulative, rng.random(len(fits)) * cumulative[-1], side='right')
+
+def sus_selection_array(fits, rng=None):
+    """Muestreo universal estocástico (SUS): len(fits) punteros equiespaciados sobre la ruleta."""
+    rng = rng or np.random.default_rng()
+    cumulative = np.cumsum(fits)
+    step = cumulative[-1] / len(fits)
+    pointers = rng.random() * step + step * np.arange(len(fits))
+    return np.minimum(np.searchsorted(cumulative, pointers, side='right'), len(fits) - 1)
+
+def position_map(matrix, lengths, n):
+    """
+    Mapa de posiciones de toda la población: claves fila * n + nodo ordenadas y su posición.
+    Permite saber en qué posición aparece un nodo en un individuo con una búsqueda binaria.
+    """
+    rows, cols = np.nonzero(np.arange(matrix.shape[1]) < lengths[:, None])
+    keys = rows * n + matrix[rows, cols]
+    # `nonzero` recorre las filas en orden, así que con un orden estable la primera aparición
+    # de un nodo repetido va antes.
+    order = np.argsort(keys, kind='stable')
+    return keys[order], cols[order]
+
+def crossover_array(matrix, lengths, first, second, n, crossover_rate, rng, tries=3):
+    """
+    Cruce vectorizado en un nodo común para las parejas (first[i], second[i]).
+    Se elige una posición interior de p1 y se busca su nodo en p2 con el mapa de posiciones
+    (hasta `tries` intentos); si aparece en el interior de p2 en la posición j, los hijos son
+    p1[:i] + p2[j:] y p2[:j] + p1[i:]. Si no hay cruce, los hijos son copias de los padres.
+    Devuelve (matriz de hijos, longitudes).
+    """
+    keys, positions = position_map(matrix, lengths, n)
+    a, b = matrix[first], matrix[second]
+    la, lb = lengths[first], lengths[second]
+    m = len(first)
+
+    # Por defecto (sin cruce) i = len(p1) y j = len(p2), que reproduce a los padres.
+    cut_a, cut_b = la.copy(), lb.copy()
+    pending = (rng.random(m) < crossover_rate) & (la > 2) & (lb > 2)
+    for _ in range(tries):
+        rows = np.flatnonzero(pending)
+        if len(rows) == 0:
+            break
+        i = 1 + (rng.random(len(rows)) * (la[rows] - 2)).astype(np.int64)  # Posición interior de p1.
+        query = second[rows] * n + a[rows, i]
+        loc = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+        j = positions[loc]
+        ok = (keys[loc] == query) & (j >= 1) & (j <= lb[rows] - 2)
+        cut_a[rows[ok]], cut_b[rows[ok]] = i[ok], j[ok]
+        pending[rows[ok]] = False
+
+    def splice(x, y, cut_x, cut_y, len_y):
+        # Hijo x[:cut_x] + y[cut_y:] construido con índices, sin bucles por individuo.
+        child_len = cut_x + len_y - cut_y
+        cols = np.arange(int(child_len.max()))[None, :]
+        from_x = np.take_along_axis(x, np.minimum(cols, x.shape[1] - 1).repeat(m, 0), axis=1)
+        y_idx = np.clip(cols - cut_x[:, None] + cut_y[:, None], 0, y.shape[1] - 1)
+        from_y = np.take_along_axis(y, y_idx, axis=1)
+        child = np.where(cols < cut_x[:, None], from_x, from_y)
+        child[cols >= child_len[:, None]] = PAD
+        return child, child_len
+
+    c1, l1 = splice(a, b, cut_a, cut_b, lb)
+    c2, l2 = splice(b, a, cut_b, cut_a, la)
+    width = max(c1.shape[1], c2.shape[1])
+    children = np.full((2 * m, width), PAD, dtype=np.int64)
+    children[:m, :c1.shape[1]] = c1
+    children[m:, :c2.shape[1]] = c2
+    return children, np.concatenate([l1, l2])
+
+def neighbor_table(edge_keys, n, reach):
+    """
+    Tabla de vecinos (n, grado máximo) rellenada con PAD. Las claves de arista ordenadas
+    (u * n + v) son un CSR implícito: la fila u guarda, en ese orden, los vecinos v de u
+    que pueden llegar al objetivo (`reach`, máscara booleana por nodo).
+    """
+    u, v = edge_keys // n, edge_keys % n
+    keep = reach[v]
+    u, v = u[keep], v[keep]
+    indptr = np.searchsorted(u, np.arange(n + 1))
+    table = np.full((n, max(int(np.diff(indptr).max(initial=0)), 1)), PAD, dtype=np.int64)
+    table[u, np.arange(len(u)) - indptr[u]] = v
+    return table
+
+def random_paths_array(table, starts, goal, rng, chunk=None):
+    """
+    Caminos aleatorios en lote desde cada nodo de `starts` hasta `goal`, con la regla de
+    `Graph.random_path`: avanzar a un vecino de `table` aún no usado, elegido al azar, o
+    retroceder un paso si no queda ninguno. Todos los paseos de un bloque avanzan a la vez;
+    se procesan por bloques de `chunk` paseos porque la máscara de nodos usados y la matriz
+    de caminos ocupan chunk × n elementos. Cada inicio debe poder llegar a `goal`.
+    Devuelve (matriz rellenada con PAD, longitudes).
+    """
+    n = len(table)
+    starts = np.asarray(starts, dtype=np.int64)
+    chunk = chunk or max(1, (1 << 22) // n)
+    blocks = []
+    for lo in range(0, len(starts), chunk):
+        first = starts[lo:lo + chunk]
+        m = len(first)
+        paths = np.full((m, n), PAD, dtype=np.int64)
+        paths[:, 0] = first
+        lengths = np.ones(m, dtype=np.int64)
+        used = np.zeros((m, n), dtype=bool)
+        used[np.arange(m), first] = True
+        active = np.flatnonzero(first != goal)
+        while len(active):
+            cand = table[paths[active, lengths[active] - 1]]          # (A, grado)
+            ok = (cand != PAD) & ~used[active[:, None], cand]
+            # Vecino al azar entre los válidos: el de mayor clave aleatoria.
+            pick = np.where(ok, rng.random(cand.shape), -1.0).argmax(axis=1)
+            stuck = ~ok.any(axis=1)
+            go, nxt = active[~stuck], cand[~stuck, pick[~stuck]]
+            paths[go, lengths[go]] = nxt
+            lengths[go] += 1
+            used[go, nxt] = True
+            back = active[stuck]  # Sin vecinos útiles: retrocede un paso.
+            lengths[back] -= 1
+            if (lengths[back] == 0).any():
+                raise ValueError("Algún inicio no puede llegar al objetivo")
+            paths[back, lengths[back]] = PAD
+            active = active[paths[active, lengths[active] - 1] != goal]
+        blocks.append((paths[:, :int(lengths.max())], lengths))
+
+    width = max((b.shape[1] for b, _ in blocks), default=1)
+    matrix = np.full((len(starts), width), PAD, dtype=np.int64)
+    lo = 0
+    for b, _ in blocks:
+        matrix[lo:lo + len(b), :b.shape[1]] = b
+        lo += len(b)
+    lengths = np.concatenate([l for _, l in blocks]) if blocks else np.zeros(0, dtype=np.int64)
+    return matrix, lengths
+
+def mutate_array(matrix, lengths, rows, table, goal, rng):
+    """
+    Mutación vectorizada de las filas `rows` (caminos que terminan en `goal`): como `mutate`,
+    sustituye el sufijo desde una posición interior al azar por un camino nuevo generado con
+    `random_paths_array`. Devuelve (matriz, longitudes); la matriz se ensancha si hace falta.
+    """
+    idx = 1 + (rng.random(len(rows)) * (lengths[rows] - 2)).astype(np.int64)
+    suffix, suffix_len = random_paths_array(table, matrix[rows, idx], goal, rng)
+    new_len = idx + suffix_len
+    width = max(matrix.shape[1], int(new_len.max()))
+    if width > matrix.shape[1]:
+        grown = np.full((len(matrix), width), PAD, dtype=np.int64)
+        grown[:, :matrix.shape[1]] = matrix
+        matrix = grown
+    cols = np.arange(width)[None, :]
+    from_suffix = np.take_along_axis(suffix, np.clip(cols - idx[:, None], 0, suffix.shape[1] - 1), axis=1)
+    child = np.where(cols < idx[:, None], matrix[rows], from_suffix)
+    child[cols >= new_len[:, None]] = PAD
+    matrix[rows] = child
+    lengths[rows] = new_len
+    return matrix, lengths
+
+def genetic_algorithm_graph_array(graph, start, goal,
+                                  pop_size=1000, generations=100,
+                                  crossover_rate=0.8, mutation_rate=0.1,
+                                  selection='tournament', k=3, seed=None):
+    """
+    Algoritmo Genético con la población codificada como matriz de NumPy (ids de nodo rellenados
+    con PAD y un vector de longitudes), pensado para poblaciones grandes (10^5 individuos).
+    - selection: 'tournament' (torneo de tamaño `k`), 'roulette' o 'sus'.
+    La población inicial y la mutación se generan con paseos aleatorios en lote
+    (`random_paths_array`); evaluación, selección y cruce también son vectorizados, así que
+    ninguna etapa recorre los individuos en Python. El coste de los paseos crece con la
+    longitud de los caminos aleatorios, que depende del grafo, y la memoria es proporcional a
+    pop_size × longitud del camino más largo (con caminos de cientos de nodos, 10^5 individuos
+    ocupan varios GB entre la matriz y las copias del cruce).
+    """
+    rng = np.random.default_rng(seed)
+
+    # Numeración entera de los nodos y tabla ordenada de aristas (u * n + v → peso).
+    names = list(dict.fromkeys([start, goal] + list(graph.adj_list) +
+                               [v for nbrs in graph.adj_list.values() for v, _ in nbrs]))
+    ids = {name: i for i, name in enumerate(names)}
+    n = len(names)
+    first_weight = {}
+    for u, nbrs in graph.adj_list.items():
+        for v, w in nbrs:
+            first_weight.setdefault(ids[u] * n + ids[v], w)  # Primera arista, como `path_cost`.
+    edge_keys = np.array(sorted(first_weight), dtype=np.int64)
+    edge_weights = np.array([first_weight[key] for key in edge_keys.tolist()])
+
+    # Vecinos que pueden llegar al objetivo, para los paseos aleatorios.
+    reach = np.zeros(n, dtype=bool)
+    reach[[ids[v] for v in graph.nodes_reaching(goal)]] = True
+    if not reach[ids[start]]:
+        return None, None  # El objetivo no es alcanzable.
+    table = neighbor_table(edge_keys, n, reach)
+    goal_id = ids[goal]
+
+    matrix, lengths = random_paths_array(table, np.full(pop_size, ids[start]), goal_id, rng)
+    best_path, best_cost = None, float('inf')
+    select = {
+        'tournament': lambda f: tournament_selection_array(f, k, rng),
+        'roulette': lambda f: roulette_selection_array(f, rng),
+        'sus': lambda f: sus_selection_array(f, rng),
+    }[selection]
+
+    for gen in range(generations):
+        costs = population_costs(matrix, lengths, edge_keys, edge_weights, n)
+        fits = 1.0 / (1 + costs)
+
+        # Actualiza la mejor solución global.
+        best = int(np.argmin(costs))
+        if costs[best] < best_cost:
+            best_cost = costs[best].item()
+            best_path = [names[v] for v in matrix[best, :lengths[best]]]
+
+        # Selección y cruce vectorizados: parejas consecutivas de individuos seleccionados.
+        selected = select(fits)
+        half = (pop_size + 1) // 2
+        partners = rng.permutation(selected)
+        matrix, lengths = crossover_array(matrix, lengths, selected[:half], partners[:half],
+                                          n, crossover_rate, rng)
+        matrix, lengths = matrix[:pop_size], lengths[:pop_size]
+
+        # Mutación: regenera un sufijo aleatorio en los individuos elegidos.
+        mutants = np.flatnonzero((rng.random(pop_size) < mutation_rate) & (lengths > 2))
+        if len(mutants):
+            matrix, lengths = mutate_array(matrix, lengths, mutants, table, goal_id, rng)
+
+    return best_path, best_cost
+
 if __name__ == "__main__":
     # Ejemplo en grafo
     g = Graph()  # Crea una instancia de un grafo vacío.
@@ -195,3 +733,25 @@ if __name__ == "__main__":
         print(f"Mejor camino: {path} con coste: {cost}")
     else:
         print("No se encontró solución.")
+
+    # Misma búsqueda con la población codificada como matriz de NumPy.
+    path, cost = genetic_algorithm_graph_array(
+        g, start, goal,
+        pop_size=200, generations=50,
+        crossover_rate=0.7, mutation_rate=0.05, seed=0
+    )
+    if path:
+        print(f"Mejor camino (población matricial): {path} con coste: {cost}")
+    else:
+        print("No se encontró solución.")
+
+    # Modelo de islas: 4 procesos con migración en anillo cada 10 generaciones.
+    path, cost = island_genetic_algorithm_graph(
+        g, start, goal,
+        islands=4, pop_size=30, generations=50,
+        crossover_rate=0.7, mutation_rate=0.05, seed=0
+    )
+    if path:
+        print(f"Mejor camino (modelo de islas): {path} con coste: {cost}")
+    else:
+        print("No se encontró solución.")
@@ -1,4 +1,8 @@
+import heapq  # Importa heapq para la lista abierta del A* acotado y la actualización tipo Dijkstra.
+import itertools  # Importa itertools para desempatar entradas del heap sin comparar estados.
 import random  # Importa el módulo random para operaciones relacionadas con la aleatoriedad.
+import time  # Importa time para el presupuesto de tiempo por movimiento.
+import numpy as np  # Importa numpy para guardar la heurística aprendida como array indexado por enteros.
 
 class Graph:
     """
@@ -79,6 +83,353 @@ def lrta_star(graph, start, goal, heuristic, max_steps=1000):
     # Devuelve el camino recorrido, que es una lista de nodos.
     return path
 
+def lss_lrta_star(graph, start, goal, heuristic, lookahead=10, max_steps=1000,
+                  time_budget=None, update='dijkstra'):
+    """
+    LSS-LRTA* / RTAA*: búsqueda en línea con anticipación acotada.
+
+    En cada movimiento ejecuta un A* desde el estado actual limitado a `lookahead`
+    expansiones (y, opcionalmente, a `time_budget` segundos), actualiza la heurística
+    de toda la región expandida y avanza por el árbol de búsqueda hasta el mejor
+    estado de la frontera. Así la latencia por acción queda acotada y el agente sale
+    de los mínimos locales profundos en muchos menos pasos que con `lrta_star`.
+
+    Parámetros:
+    - graph, start, goal, heuristic, max_steps: como en `lrta_star`.
+    - lookahead: número máximo de expansiones del A* por movimiento (>= 1).
+    - time_budget: segundos máximos de A* por movimiento (None = sin límite); siempre se
+      expande al menos un estado.
+    - update: 'dijkstra' (LSS-LRTA*, propaga H desde la frontera hacia la región cerrada)
+      o 'rtaa' (RTAA*, H(s) = f(mejor de la frontera) - g(s), más barato).
+
+    Retorna:
+    - path: lista de nodos que representa el camino recorrido.
+    """
+    H = dict(heuristic)  # Copia de las heurísticas que el agente irá aprendiendo.
+    inf = float('inf')
+    counter = itertools.count()  # Desempate en los heaps.
+    path = [start]
+    current = start
+
+    while current != goal and len(path) - 1 < max_steps:
+        # --- A* acotado desde `current` ---
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
+        g = {current: 0}
+        parent = {current: None}
+        preds = {}         # Predecesores dentro de la región: s2 -> [(s, coste)].
+        closed = set()
+        # Los empates en f se rompen por orden de generación (el orden de la lista de
+        # adyacencia), igual que `lrta_star`: con lookahead=1 ambos dan los mismos pasos.
+        open_heap = [(H.get(current, inf), next(counter), 0, current)]
+        expansions = 0
+        target = None
+
+        while open_heap:
+            f, _, gs, s = open_heap[0]
+            if gs > g[s]:
+                heapq.heappop(open_heap)  # Entrada obsoleta: ya hay un g mejor para `s`.
+                continue
+            # Para al sacar el objetivo o al agotar el presupuesto: `s` es el mejor de la frontera.
+            if (s == goal or expansions >= lookahead
+                    or (deadline is not None and expansions and time.perf_counter() > deadline)):
+                target = s
+                break
+            heapq.heappop(open_heap)
+            closed.add(s)
+            expansions += 1
+            for s2, cost in graph.get_neighbors(s):
+                preds.setdefault(s2, []).append((s, cost))
+                ng = gs + cost
+                if ng < g.get(s2, inf):
+                    g[s2] = ng
+                    parent[s2] = s
+                    heapq.heappush(open_heap, (ng + H.get(s2, inf), next(counter), ng, s2))
+
+        if target is None:
+            # La frontera se vació sin llegar al objetivo: no hay forma de continuar.
+            print(f"No hay sucesores desde {current}, detenido.")
+            break
+
+        # --- Actualización de H en la región expandida ---
+        if update == 'rtaa':
+            f_target = g[target] + H.get(target, inf)
+            for s in closed:
+                H[s] = f_target - g[s]
+        else:
+            # Dijkstra desde la frontera: H(s) = min (c(s, s2) + H(s2)) sobre la región cerrada.
+            for s in closed:
+                H[s] = inf
+            frontier = [(H.get(s, inf), next(counter), s) for s in g if s not in closed]
+            heapq.heapify(frontier)
+            while frontier:
+                hs, _, s = heapq.heappop(frontier)
+                if hs > H.get(s, inf):
+                    continue  # Entrada obsoleta.
+                for p, cost in preds.get(s, ()):
+                    if p in closed and H[p] > cost + hs:
+                        H[p] = cost + hs
+                        heapq.heappush(frontier, (H[p], next(counter), p))
+
+        # --- Movimiento por el árbol de búsqueda hasta `target` ---
+        route = []
+        node = target
+        while node != current:
+            route.append(node)
+            node = parent[node]
+        route.reverse()
+        path.extend(route[:max_steps - (len(path) - 1)])
+        current = path[-1]
+
+    return path
+
+def graph_to_arrays(graph, extra_nodes=()):
+    """
+    Representación en arrays del grafo para simular muchos agentes a la vez.
+
+    Retorna (nodes, index, nbr, cost):
+    - nodes: lista índice → nodo; index: dict nodo → índice.
+    - nbr: matriz (n, grado máximo) con los índices de los vecinos de cada nodo, en el
+      mismo orden que la lista de adyacencia; el relleno apunta al nodo 0.
+      `extra_nodes` añade nodos aislados (p. ej. inicios sin aristas) al final.
+    - cost: matriz del mismo tamaño con el coste de cada arista (inf en el relleno, de
+      modo que nunca gana un argmin frente a una arista real).
+    """
+    nodes = list(graph.adj_list)
+    index = {v: i for i, v in enumerate(nodes)}
+    for u in list(graph.adj_list):
+        for v, _ in graph.adj_list[u]:
+            if v not in index:  # Nodos que solo aparecen como destino.
+                index[v] = len(nodes)
+                nodes.append(v)
+    for v in extra_nodes:
+        if v not in index:
+            index[v] = len(nodes)
+            nodes.append(v)
+    degree = max((len(graph.get_neighbors(v)) for v in nodes), default=0)
+    nbr = np.zeros((len(nodes), max(degree, 1)), dtype=np.int64)
+    cost = np.full((len(nodes), max(degree, 1)), np.inf)
+    for i, v in enumerate(nodes):
+        for j, (w, c) in enumerate(graph.get_neighbors(v)):
+            nbr[i, j] = index[w]
+            cost[i, j] = c
+    return nodes, index, nbr, cost
+
+def simulate_lrta_agents(graph, starts, goal, heuristic, max_steps=1000, shared_h=True):
+    """
+    Simula en bloque N agentes LRTA* hacia el mismo `goal`, avanzando todos a la vez en
+    cada tic con operaciones de NumPy sobre sus posiciones.
+
+    Cada agente aplica exactamente la regla de `lrta_star` (H(s) = min f, moverse al
+    sucesor de menor f; ante empates, el primero de la lista de adyacencia). Con
+    `shared_h=True` todos leen y escriben una única tabla H, de modo que lo que aprende
+    uno lo aprovechan los demás; las actualizaciones de un tic son simultáneas. Con
+    `shared_h=False` cada agente tiene su propia fila de H (memoria N × nodos) y se
+    comporta igual que una ejecución independiente de `lrta_star`.
+
+    Parámetros:
+    - graph, goal, heuristic, max_steps: como en `lrta_star` (max_steps = tics máximos).
+    - starts: secuencia con el nodo inicial de cada agente.
+
+    Retorna un diccionario con:
+    - 'steps', 'costs': pasos y coste recorrido por cada agente (arrays de tamaño N).
+    - 'reached', 'stuck': máscaras de agentes que llegaron / quedaron sin sucesores.
+    - 'positions': nodo final de cada agente.
+    - 'ticks', 'elapsed', 'steps_per_second': tics simulados, segundos y pasos de agente
+      por segundo agregados.
+    - 'lengths': distribución de longitudes de los agentes que llegaron (min, p10,
+      mediana, media, p90, max), o None si ninguno llegó.
+    - 'H': tabla aprendida (vector compartido o matriz por agente), indexada como `nodes`.
+    - 'nodes': lista índice → nodo.
+    """
+    nodes, index, nbr, cost = graph_to_arrays(graph, extra_nodes=[*starts, goal])
+    goal_idx = index[goal]
+    n_agents = len(starts)
+    pos = np.array([index[s] for s in starts], dtype=np.int64)
+    h0 = np.array([heuristic.get(v, float('inf')) for v in nodes], dtype=float)
+    H = h0 if shared_h else np.tile(h0, (n_agents, 1))
+    dead_end = np.isinf(cost[:, 0])  # Nodos sin sucesores (solo relleno).
+
+    steps = np.zeros(n_agents, dtype=np.int64)
+    costs = np.zeros(n_agents)
+    stuck = np.zeros(n_agents, dtype=bool)
+    active = pos != goal_idx
+    ticks = 0
+
+    t0 = time.perf_counter()
+    for ticks in range(1, max_steps + 1):
+        agents = np.flatnonzero(active)
+        if agents.size == 0:
+            ticks -= 1  # Este tic no llegó a simularse.
+            break
+        p = pos[agents]
+
+        # Agentes en callejón sin salida: se detienen como en `lrta_star`.
+        blocked = dead_end[p]
+        if blocked.any():
+            stuck[agents[blocked]] = True
+            active[agents[blocked]] = False
+            agents, p = agents[~blocked], p[~blocked]
+            if agents.size == 0:
+                continue
+
+        nb = nbr[p]                                              # (A, grado)
+        c = cost[p]
+        f = c + (H[nb] if shared_h else H[agents[:, None], nb])  # f = coste + H(sucesor)
+        best = f.argmin(axis=1)                                  # Primer mínimo, como `min`.
+        rows = np.arange(agents.size)
+
+        # Actualiza H(s) con el mínimo f; con H compartida, los agentes en el mismo estado
+        # calculan el mismo valor, así que las escrituras repetidas no entran en conflicto.
+        if shared_h:
+            H[p] = f[rows, best]
+        else:
+            H[agents, p] = f[rows, best]
+
+        pos[agents] = nb[rows, best]
+        steps[agents] += 1
+        costs[agents] += c[rows, best]
+        active[agents] = pos[agents] != goal_idx
+    elapsed = time.perf_counter() - t0
+
+    reached = pos == goal_idx
+    lengths = None
+    if reached.any():
+        done = steps[reached]
+        lengths = {
+            'min': int(done.min()),
+            'p10': float(np.percentile(done, 10)),
+            'median': float(np.median(done)),
+            'mean': float(done.mean()),
+            'p90': float(np.percentile(done, 90)),
+            'max': int(done.max()),
+        }
+    return {
+        'steps': steps,
+        'costs': costs,
+        'reached': reached,
+        'stuck': stuck,
+        'positions': [nodes[i] for i in pos],
+        'ticks': ticks,
+        'elapsed': elapsed,
+        'steps_per_second': steps.sum() / elapsed if elapsed > 0 else float('inf'),
+        'lengths': lengths,
+        'H': H,
+        'nodes': nodes,
+    }
+
+def _object_array(items):
+    """Array 1D de objetos; se asigna uno a uno para que las tuplas no se conviertan en filas."""
+    arr = np.empty(len(items), dtype=object)
+    for i, item in enumerate(items):
+        arr[i] = item
+    return arr
+
+class LRTAStarAgent:
+    """
+    Agente LRTA* cuya heurística aprendida H persiste entre llamadas y entre ensayos.
+    Como H depende del objetivo, cada agente está ligado a un `goal`.
+    Los estados se numeran con enteros la primera vez que aparecen y H se guarda en un
+    array de NumPy indexado por ese número (crece por duplicación), lo que ocupa mucho
+    menos que un diccionario en conjuntos grandes de estados.
+    """
+    def __init__(self, graph, goal, heuristic):
+        self.graph = graph                 # Grafo sobre el que actúa el agente.
+        self.goal = goal                   # Objetivo para el que se aprende H.
+        self.heuristic = heuristic         # Heurística inicial para estados aún no vistos.
+        self.index = {}                    # Estado → índice entero.
+        self.states = []                   # Índice entero → estado.
+        self.H = np.empty(16)              # H aprendida; solo son válidas las len(states) primeras.
+        self.trials = []                   # Estadísticas de cada ensayo (ver `run_trial`).
+
+    def _id(self, state):
+        """Índice entero de `state`, inicializando su H con la heurística si es nuevo."""
+        i = self.index.get(state)
+        if i is None:
+            i = self.index[state] = len(self.states)
+            self.states.append(state)
+            if i == len(self.H):
+                self.H = np.concatenate([self.H, np.empty(len(self.H))])  # Duplica la capacidad.
+            self.H[i] = self.heuristic.get(state, float('inf'))
+        return i
+
+    def h(self, state):
+        """Valor actual de H para `state`."""
+        i = self._id(state)
+        return self.H[i]
+
+    def run_trial(self, start, max_steps=1000):
+        """
+        Ejecuta un ensayo de LRTA* desde `start` reutilizando (y actualizando) la H aprendida.
+        Registra en `trials` los pasos, el coste recorrido, si se alcanzó el objetivo, cuántos
+        valores de H cambiaron y el mayor cambio. Retorna el camino recorrido.
+        """
+        path = [start]
+        current = start
+        cost_so_far = 0
+        updates = 0
+        max_change = 0.0
+
+        for step in range(max_steps):
+            if current == self.goal:
+                break
+
+            neighbors = self.graph.get_neighbors(current)
+            if not neighbors:
+                print(f"No hay sucesores desde {current}, detenido.")
+                break
+
+            # f = coste + H para cada sucesor, leyendo la H persistente.
+            best_next, best_cost, min_f = None, 0, float('inf')
+            for s2, cost in neighbors:
+                j = self._id(s2)  # Antes de leer self.H: `_id` puede reemplazar el array.
+                f = cost + self.H[j]
+                if f < min_f or best_next is None:
+                    best_next, best_cost, min_f = s2, cost, f
+
+            # Actualiza H del estado actual con el mínimo f de sus sucesores.
+            i = self._id(current)
+            if self.H[i] != min_f:
+                updates += 1
+                if np.isfinite(self.H[i]) and np.isfinite(min_f):
+                    max_change = max(max_change, abs(min_f - self.H[i]))
+                self.H[i] = min_f
+
+            path.append(best_next)
+            cost_so_far += best_cost
+            current = best_next
+
+        self.trials.append({
+            'steps': len(path) - 1,
+            'cost': cost_so_far,
+            'reached': current == self.goal,
+            'updates': updates,
+            'max_change': max_change,
+        })
+        return path
+
+    def converged(self, window=1):
+        """True si los últimos `window` ensayos llegaron al objetivo sin cambiar ningún valor de H."""
+        recent = self.trials[-window:]
+        return len(recent) == window and all(t['reached'] and t['updates'] == 0 for t in recent)
+
+    def save(self, filename):
+        """Guarda la H aprendida, la numeración de estados y el historial de ensayos en un .npz."""
+        np.savez(filename, H=self.H[:len(self.states)], states=_object_array(self.states),
+                 trials=_object_array(self.trials), goal=_object_array([self.goal]))
+
+    @classmethod
+    def load(cls, filename, graph, heuristic):
+        """Crea un agente a partir de un fichero guardado con `save`."""
+        data = np.load(filename, allow_pickle=True)
+        agent = cls(graph, data['goal'][0], heuristic)
+        agent.states = list(data['states'])
+        agent.index = {state: i for i, state in enumerate(agent.states)}
+        agent.H = np.array(data['H'], dtype=float)
+        if len(agent.H) == 0:
+            agent.H = np.empty(16)
+        agent.trials = list(data['trials'])
+        return agent
+
 if __name__ == "__main__":
     # Definir un grafo de ejemplo.
     g = Graph()
@@ -109,3 +460,20 @@ if __name__ == "__main__":
     
     # Imprime el camino encontrado desde `start` hasta `goal`.
     print(f"Camino LRTA* desde {start} hasta {goal}: {path}")
+
+    # Agente con H persistente: repite el trayecto hasta que H deja de cambiar.
+    agent = LRTAStarAgent(g, goal, heuristic)
+    for trial in range(10):
+        path = agent.run_trial(start)
+        if agent.converged():
+            break
+    print(f"Agente LRTA* convergido tras {len(agent.trials)} ensayos: {path}")
+
+    # LSS-LRTA* con 3 expansiones de anticipación por movimiento.
+    path = lss_lrta_star(g, start, goal, heuristic, lookahead=3)
+    print(f"Camino LSS-LRTA* desde {start} hasta {goal}: {path}")
+
+    # Simulación en bloque de 1000 agentes LRTA* que comparten H.
+    result = simulate_lrta_agents(g, [random.choice('ABC') for _ in range(1000)], goal, heuristic)
+    print(f"1000 agentes: {result['reached'].sum()} llegaron, "
+          f"{result['steps_per_second']:.0f} pasos/s, longitudes {result['lengths']}")
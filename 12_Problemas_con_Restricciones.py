@@ -1,36 +1,130 @@
+from collections import deque  # Importa deque para la cola de arcos de MAC.
+import heapq  # Importa heapq para la cola de prioridad de la ordenación de variables.
+import multiprocessing  # Importa multiprocessing para la resolución en paralelo.
+import os  # Importa os para conocer el número de CPUs.
+import pickle  # Importa pickle para enviar instantáneas del problema a los procesos.
+import random  # Importa random para diversificar los resolutores del portfolio.
+import numpy as np  # Importa numpy para las tablas de restricciones y los contadores de LCV.
+
+def compile_constraints(variables, domains, neighbors, constraints, relation_key=None):
+    """
+    Evalúa cada restricción binaria una sola vez y la guarda como matriz booleana.
+
+    Retorna (index, tables):
+    - index[v]: {valor: posición} en el dominio de `v`.
+    - tables[(x, y)]: matriz de NumPy con T[i, j] = constraints(x, Dx[i], y, Dy[j]).
+    La restricción se supone simétrica, así que el arco (y, x) usa la traspuesta de (x, y).
+    Si `relation_key(x, y)` devuelve la misma clave para dos arcos con los mismos dominios,
+    ambos comparten matriz (p. ej. en coloreado todas las aristas son la relación "distinto").
+    """
+    index = {v: {val: i for i, val in enumerate(domains[v])} for v in variables}
+    tables = {}
+    cache = {}  # (clave de relación, dominio x, dominio y) → (T, T traspuesta).
+    for x in variables:
+        for y in neighbors[x]:
+            if (x, y) in tables:
+                continue
+            dx, dy = domains[x], domains[y]
+            key = (relation_key(x, y), tuple(dx), tuple(dy)) if relation_key is not None else None
+            pair = cache.get(key) if key is not None else None
+            if pair is None:
+                table = np.array([[bool(constraints(x, a, y, b)) for b in dy] for a in dx],
+                                 dtype=bool).reshape(len(dx), len(dy))
+                pair = (table, table.T)
+                if key is not None:
+                    cache[key] = pair
+            tables[(x, y)] = pair[0]
+            tables.setdefault((y, x), pair[1])
+    return index, tables
+
 class CSP:
     """
     Clase genérica para resolver Problemas de Satisfacción de Restricciones (CSP) mediante backtracking
-    con Forward Checking y heurística MRV (Minimum Remaining Values).
+    con Forward Checking (o MAC) y heurística MRV (Minimum Remaining Values).
     """
-    def __init__(self, variables, domains, neighbors, constraints):
+    def __init__(self, variables, domains, neighbors, constraints, ordering=None,
+                 value_ordering=None, compiled=False, relation_key=None, inference='fc'):
         """
         Inicializa un problema CSP.
         - `variables`: Lista de variables del CSP (por ejemplo, regiones a colorear).
         - `domains`: Diccionario donde cada variable tiene un dominio de valores posibles.
         - `neighbors`: Diccionario de vecinos de cada variable (es decir, variables que están conectadas entre sí).
         - `constraints`: Función que determina si una asignación de valores a dos variables es válida.
+        - `ordering`: None (MRV recorriendo todas las variables), 'mrv' (MRV indexado con
+          desempate por grado) o 'domwdeg' (dom/wdeg ponderado por conflictos). Ver `VariableOrder`.
+        - `value_ordering`: None (orden del dominio) o 'lcv' (Least Constraining Value con
+          contadores de soporte incrementales). Ver `SupportCounts`.
+        - `compiled`: si es True, las restricciones se precompilan en tablas booleanas
+          (`compile_constraints`) y las comprobaciones pasan a ser consultas a esas tablas.
+        - `relation_key`: función (x, y) → clave para compartir tablas entre arcos.
+        - `inference`: 'fc' (Forward Checking) o 'mac' (Maintaining Arc Consistency: AC-3
+          tras cada asignación, empezando por los arcos de la variable asignada).
         """
+        if inference not in ('fc', 'mac'):
+            raise ValueError(f"Inferencia desconocida: {inference!r}")
         self.variables = variables  # Lista de todas las variables del CSP.
         # Crea una copia de los dominios de cada variable, asegurando que los valores de cada dominio sean listas.
         self.domains = {v: list(domains[v]) for v in variables}
         self.neighbors = neighbors  # Diccionario de vecinos de cada variable.
         self.constraints = constraints  # Función que define las restricciones entre dos variables.
+        self.ordering = ordering  # Heurística de ordenación de variables indexada (o None).
+        self.order = None  # Instancia de `VariableOrder` activa durante `solve`.
+        self.value_ordering = value_ordering  # Heurística de ordenación de valores (o None).
+        self.supports = None  # Instancia de `SupportCounts` activa durante `solve`.
+        self.tables = None  # Tablas de compatibilidad precompiladas (o None).
+        self.rng = None  # random.Random para romper empates al azar (portfolio paralelo) o None.
+        self.inference = inference  # Propagación tras cada asignación: 'fc' o 'mac'.
+        self.conflict_arc = None  # Arco (Xi, Xj) que vació un dominio en la última propagación de MAC.
+        self._adj = None  # Grafo de restricciones simétrico, construido al usar MAC.
+        if compiled:
+            self.value_index, self.tables = compile_constraints(
+                variables, self.domains, neighbors, constraints, relation_key)
+            # Copia en listas para consultas escalares rápidas (una por matriz distinta).
+            lists = {}
+            self._rows = {}
+            for arc, t in self.tables.items():
+                if id(t) not in lists:
+                    lists[id(t)] = t.tolist()
+                self._rows[arc] = lists[id(t)]
 
     def assign(self, var, val, assignment):
         """Asigna un valor `val` a la variable `var` en el diccionario `assignment`."""
         assignment[var] = val
+        if self.order is not None:
+            self.order.on_assign(var)
 
     def unassign(self, var, assignment):
         """Elimina la asignación de la variable `var` en el diccionario `assignment`."""
         if var in assignment:
             del assignment[var]
+            if self.order is not None:
+                self.order.on_unassign(var)
+
+    def domain(self, var):
+        """Valores que quedan en el dominio de `var`."""
+        return list(self.domains[var])
+
+    def domain_size(self, var):
+        """Número de valores que quedan en el dominio de `var`."""
+        return len(self.domains[var])
+
+    def pruned_values(self, var, saved):
+        """Valores de `var` podados en este nivel, según lo guardado en `removed[var]`."""
+        return saved
 
     def consistent(self, var, val, assignment):
         """
         Comprueba si la asignación de `val` a la variable `var` es consistente con las restricciones 
         del problema, es decir, que no viole ninguna restricción con las variables ya asignadas.
         """
+        if self.tables is not None:
+            # Versión compilada: consulta la tabla en lugar de llamar a `constraints`.
+            rows, index = self._rows, self.value_index
+            i = index[var][val]
+            for other in self.neighbors[var]:
+                if other in assignment and not rows[(var, other)][i][index[other][assignment[other]]]:
+                    return False
+            return True
         # Revisa las variables vecinas de `var` para ver si alguna tiene una asignación incompatible.
         for other in self.neighbors[var]:
             if other in assignment and not self.constraints(var, val, other, assignment[other]):
@@ -42,6 +136,20 @@ class CSP:
         Realiza un Forward Checking: elimina valores inconsistentes de los dominios de los vecinos
         no asignados de `var` y actualiza el diccionario `removed` con los valores eliminados.
         """
+        if self.tables is not None:
+            # Versión compilada: la fila de la tabla dice qué valores del vecino sobreviven.
+            rows, index = self._rows, self.value_index
+            i = index[var][val]
+            for nbr in self.neighbors[var]:
+                if nbr not in assignment:
+                    row, nbr_index, domain = rows[(var, nbr)][i], index[nbr], self.domains[nbr]
+                    keep = [v2 for v2 in domain if row[nbr_index[v2]]]
+                    if len(keep) < len(domain):
+                        removed.setdefault(nbr, []).extend(v2 for v2 in domain if not row[nbr_index[v2]])
+                        domain[:] = keep
+                        if not keep:
+                            return False
+            return True
         # Para cada vecino no asignado de `var`, verifica si alguna de sus posibles asignaciones
         # es inconsistente con la asignación actual.
         for nbr in self.neighbors[var]:
@@ -55,22 +163,99 @@ class CSP:
                     return False
         return True
 
+    def revise(self, Xi, Xj, removed):
+        """
+        Elimina de Xi los valores sin soporte en el dominio actual de Xj y los registra en
+        `removed` (el mismo trail que usa Forward Checking). Retorna True si eliminó alguno.
+        """
+        domain, other = self.domains[Xi], self.domains[Xj]
+        if self.tables is not None:
+            rows, ii, ij = self._rows[(Xi, Xj)], self.value_index[Xi], self.value_index[Xj]
+            cols = [ij[b] for b in other]
+            supported = [any(rows[ii[a]][c] for c in cols) for a in domain]
+        else:
+            supported = [any(self.constraints(Xi, a, Xj, b) for b in other) for a in domain]
+        if all(supported):
+            return False
+        removed.setdefault(Xi, []).extend(a for a, ok in zip(domain, supported) if not ok)
+        domain[:] = [a for a, ok in zip(domain, supported) if ok]
+        return True
+
+    def mac(self, var, val, assignment, removed):
+        """
+        Maintaining Arc Consistency: Forward Checking de var = val y, después, AC-3 entre las
+        variables sin asignar, empezando por los arcos que apuntan a los vecinos podados.
+        Todo lo eliminado queda en `removed`, así que `restore` lo deshace al retroceder.
+        """
+        self.conflict_arc = None
+        if not self.forward_check(var, val, assignment, removed):
+            return False
+        if self._adj is None:
+            self._adj = _constraint_graph(self)
+        return self.propagate_arcs(list(removed), assignment, removed)
+
+    def propagate_arcs(self, changed, assignment, removed):
+        """
+        AC-3 restringido a variables sin asignar: encola (Xk, Xj) para cada Xj de `changed`
+        y propaga. Retorna False (y deja el arco culpable en `conflict_arc`) si un dominio
+        se vacía.
+        """
+        adj = self._adj
+        queue = deque()
+        queued = set()  # Evita encolar dos veces el mismo arco.
+        for Xj in changed:
+            for Xk in adj[Xj]:
+                if Xk not in assignment and (Xk, Xj) not in queued:
+                    queue.append((Xk, Xj))
+                    queued.add((Xk, Xj))
+        while queue:
+            Xi, Xj = queue.popleft()
+            queued.discard((Xi, Xj))
+            if self.revise(Xi, Xj, removed):
+                if self.domain_size(Xi) == 0:
+                    self.conflict_arc = (Xi, Xj)
+                    return False
+                for Xk in adj[Xi]:
+                    if Xk != Xj and Xk not in assignment and (Xk, Xi) not in queued:
+                        queue.append((Xk, Xi))
+                        queued.add((Xk, Xi))
+        return True
+
+    def infer(self, var, val, assignment, removed):
+        """Propagación tras asignar var = val, según `inference`."""
+        if self.inference == 'mac':
+            return self.mac(var, val, assignment, removed)
+        return self.forward_check(var, val, assignment, removed)
+
+    def restore(self, removed):
+        """Deshace la poda registrada en `removed` por `forward_check` (o `mac`)."""
+        for v, vals in removed.items():
+            self.domains[v].extend(vals)
+
     def select_unassigned_variable(self, assignment):
         """
         Heurística MRV (Minimum Remaining Values): selecciona la variable sin asignar con el dominio más pequeño.
         """
+        # Con una ordenación indexada activa, la variable sale de su cola de prioridad.
+        if self.order is not None:
+            return self.order.select()
         # Encuentra las variables que aún no están asignadas.
         unassigned = [v for v in self.variables if v not in assignment]
         # Devuelve la variable con el dominio más pequeño (menor número de valores posibles).
-        return min(unassigned, key=lambda v: len(self.domains[v]))
+        return min(unassigned, key=self.domain_size)
 
     def order_domain_values(self, var, assignment):
         """
-        Ordena los valores del dominio de una variable `var` (en este caso se podrían usar otras heurísticas,
-        como el Least Constraining Value, pero se devuelve el dominio tal cual aquí).
+        Ordena los valores del dominio de una variable `var`. Con `value_ordering='lcv'` usa
+        Least Constraining Value; si no, devuelve el dominio tal cual.
         """
-        # Simplemente devuelve los valores del dominio de `var`.
-        return list(self.domains[var])
+        if self.supports is not None:
+            return self.supports.order(var, assignment)
+        values = self.domain(var)
+        if self.rng is not None:
+            self.rng.shuffle(values)  # Variante aleatorizada (resolutores del portfolio).
+        # Devuelve los valores del dominio de `var`.
+        return values
 
     def backtrack(self, assignment):
         """
@@ -90,23 +275,478 @@ class CSP:
                 self.assign(var, val, assignment)  # Asigna el valor a la variable en el diccionario.
                 removed = {}  # Diccionario para almacenar valores eliminados durante Forward Checking.
 
-                # Realiza Forward Checking, y si no se encuentran inconsistencias, sigue con el backtracking.
-                if self.forward_check(var, val, assignment, removed):
+                # Realiza Forward Checking (o MAC), y si no se encuentran inconsistencias, sigue con el backtracking.
+                ok = self.infer(var, val, assignment, removed)
+                if self.order is not None:
+                    self.order.pruned(var, removed, ok)  # Actualiza prioridades (y pesos si hubo fallo).
+                if self.supports is not None:
+                    self.supports.pruned(removed)  # Descuenta los soportes perdidos.
+                if ok:
                     result = self.backtrack(assignment)  # Llamada recursiva para asignar el siguiente valor.
                     if result is not None:  # Si se encontró una solución, la devuelve.
                         return result
 
                 # Si no se encontró solución, restaura los dominios eliminados por Forward Checking.
-                for v, vals in removed.items():
-                    self.domains[v].extend(vals)
+                if self.supports is not None:
+                    self.supports.restored(removed)  # Antes de restaurar, mientras se conoce lo podado.
+                self.restore(removed)
+                if self.order is not None:
+                    self.order.domains_changed(removed)
 
                 self.unassign(var, assignment)  # Desasigna la variable y prueba con el siguiente valor.
 
         return None  # Si no se encuentra solución, retorna None.
 
-    def solve(self):
-        """Inicia el proceso de resolución utilizando backtracking."""
-        return self.backtrack({})  # Inicia con un diccionario vacío para las asignaciones.
+    def solve(self, assignment=None):
+        """
+        Inicia el proceso de resolución utilizando backtracking.
+        `assignment` permite partir de una asignación parcial cuyos efectos ya están
+        aplicados a los dominios (así se reanudan los subproblemas de `solve_parallel`).
+        """
+        assignment = dict(assignment or {})  # Por defecto, un diccionario vacío.
+        if self.inference == 'mac':
+            # Consistencia de arcos inicial (no se deshace: forma parte del problema).
+            self._adj = _constraint_graph(self)
+            if not self.propagate_arcs(self.variables, assignment, {}):
+                return None
+        if self.ordering is not None:
+            self.order = VariableOrder(self, self.ordering)
+            for var in assignment:
+                self.order.on_assign(var)
+        if self.value_ordering is not None:
+            if self.value_ordering != 'lcv':
+                raise ValueError(f"Ordenación de valores desconocida: {self.value_ordering!r}")
+            self.supports = SupportCounts(self)
+        return self.backtrack(assignment)
+
+    def _split(self, assignment, depth, jobs):
+        """
+        Recorre los `depth` primeros niveles del árbol (MRV + Forward Checking) y guarda en
+        `jobs` una instantánea serializada (problema, asignación) de cada rama viva.
+        """
+        if depth == 0 or len(assignment) == len(self.variables):
+            jobs.append(pickle.dumps((self, dict(assignment))))
+            return
+        var = self.select_unassigned_variable(assignment)
+        for val in self.order_domain_values(var, assignment):
+            if self.consistent(var, val, assignment):
+                self.assign(var, val, assignment)
+                removed = {}
+                if self.infer(var, val, assignment, removed):
+                    self._split(assignment, depth - 1, jobs)
+                self.restore(removed)
+                self.unassign(var, assignment)
+
+    def solve_parallel(self, mode='portfolio', processes=None, seed=None, split_depth=1):
+        """
+        Resuelve el CSP con varios procesos; gana la primera solución y el resto se cancela.
+
+        - mode='portfolio': cada proceso resuelve el problema completo con una configuración
+          distinta. El primero usa la del propio CSP; los demás alternan entre 'domwdeg' y
+          'mrv' y desordenan los valores con una semilla propia (`seed + i`), de modo que una
+          mala elección temprana no bloquea a todos a la vez.
+        - mode='split': se expanden los `split_depth` primeros niveles del árbol y cada rama
+          viva es un subproblema independiente para el pool.
+        - processes: número de procesos (por defecto, el número de CPUs). Con 1 se ejecuta
+          todo en serie en este proceso.
+
+        Los trabajos se envían serializados con pickle, así que `constraints` debe ser una
+        función definida a nivel de módulo (no una lambda).
+        Retorna la primera solución encontrada o None si no existe.
+        """
+        processes = processes or os.cpu_count() or 1
+        if mode == 'portfolio':
+            data = pickle.dumps((self, {}))
+            variants = [self.ordering, 'domwdeg', 'mrv']
+            base = seed if seed is not None else random.randrange(2 ** 32)
+            jobs = [(data, variants[i % len(variants)] if i else self.ordering,
+                     base + i if i else None)
+                    for i in range(max(processes, 1))]
+        elif mode == 'split':
+            subproblems = []
+            self._split({}, split_depth, subproblems)
+            jobs = [(data, self.ordering, None) for data in subproblems]
+        else:
+            raise ValueError(f"Modo paralelo desconocido: {mode!r}")
+
+        if processes == 1:
+            for job in jobs:
+                result = _solve_job(job)
+                if result is not None:
+                    return result
+            return None
+        tasks = multiprocessing.Queue()
+        results = multiprocessing.Queue()
+        for job in jobs:
+            tasks.put(job)
+        for _ in range(processes):
+            tasks.put(None)  # Una marca de fin por proceso.
+        tasks.cancel_join_thread()  # Al cancelar puede quedar trabajo sin leer en la cola.
+        workers = [multiprocessing.Process(target=_solve_worker, args=(tasks, results), daemon=True)
+                   for _ in range(processes)]
+        for w in workers:
+            w.start()
+        try:
+            for _ in range(len(jobs)):
+                result = results.get()
+                if isinstance(result, BaseException):
+                    raise result
+                if result is not None:
+                    return result
+            return None
+        finally:
+            # Gana la primera solución: se cancelan los procesos que sigan buscando.
+            for w in workers:
+                w.terminate()
+            for w in workers:
+                w.join()
+
+def _solve_worker(tasks, results):
+    """Proceso de `solve_parallel`: resuelve trabajos de la cola hasta recibir None."""
+    while True:
+        job = tasks.get()
+        if job is None:
+            break
+        try:
+            results.put(_solve_job(job))
+        except Exception as exc:  # Se reenvía al proceso principal.
+            results.put(exc)
+
+def _solve_job(job):
+    """Trabajo de `solve_parallel`: reconstruye la instantánea, aplica la variante y resuelve."""
+    data, ordering, seed = job
+    csp, assignment = pickle.loads(data)
+    csp.ordering = ordering
+    if seed is not None:
+        csp.rng = random.Random(seed)
+    return csp.solve(assignment)
+
+def _constraint_graph(csp):
+    """Grafo de restricciones simétrico (por si `neighbors` solo lista un sentido)."""
+    adj = {v: set() for v in csp.variables}
+    for v in csp.variables:
+        for u in csp.neighbors[v]:
+            if u != v:
+                adj[v].add(u)
+                adj[u].add(v)
+    return adj
+
+class VariableOrder:
+    """
+    Ordenación de variables indexada para `CSP.select_unassigned_variable`.
+
+    Mantiene un heap con la prioridad de cada variable sin asignar y lo actualiza solo
+    cuando cambia algo que la afecta (poda o restauración de su dominio, asignación de un
+    vecino, nuevo conflicto), en lugar de recorrer todas las variables en cada nodo.
+    Las entradas obsoletas se descartan de forma perezosa mediante un número de versión.
+
+    Heurísticas:
+    - 'mrv': menor dominio; empata el mayor grado dinámico (vecinos sin asignar).
+    - 'domwdeg': menor dominio / wdeg, donde wdeg suma los pesos de las restricciones con
+      vecinos sin asignar; el peso de una restricción (inicialmente 1) crece cada vez que
+      vacía un dominio. Los empates se resuelven igual que en 'mrv'.
+    El último desempate es la posición en `csp.variables`, para que sea determinista (o
+    una permutación aleatoria si `csp.rng` está definido, como en el portfolio paralelo).
+    """
+    def __init__(self, csp, heuristic='mrv'):
+        if heuristic not in ('mrv', 'domwdeg'):
+            raise ValueError(f"Heurística de ordenación desconocida: {heuristic!r}")
+        self.csp = csp
+        self.heuristic = heuristic
+        ranks = list(range(len(csp.variables)))
+        if csp.rng is not None:
+            csp.rng.shuffle(ranks)  # Desempate aleatorio en las variantes del portfolio.
+        self.position = dict(zip(csp.variables, ranks))
+        self.adj = _constraint_graph(csp)
+        self.weight = {v: dict.fromkeys(self.adj[v], 1) for v in csp.variables}
+        self.degree = {v: len(self.adj[v]) for v in csp.variables}  # Vecinos sin asignar.
+        self.wdeg = {v: len(self.adj[v]) for v in csp.variables}    # Suma de pesos hacia ellos.
+        self.assigned = set()
+        self.version = dict.fromkeys(csp.variables, 0)
+        self.heap = []
+        for v in csp.variables:
+            self._push(v)
+
+    def key(self, var):
+        """Prioridad de `var` (menor es mejor)."""
+        dom = self.csp.domain_size(var)
+        if self.heuristic == 'domwdeg':
+            # Sin restricciones pendientes, la variable no restringe a nadie: va al final.
+            primary = dom / self.wdeg[var] if self.wdeg[var] else float('inf')
+        else:
+            primary = dom
+        return (primary, -self.degree[var], self.position[var])
+
+    def _push(self, var):
+        """Inserta la prioridad actual de `var`, invalidando las anteriores."""
+        self.version[var] += 1
+        heapq.heappush(self.heap, (self.key(var), self.version[var], var))
+
+    def select(self):
+        """Variable sin asignar de mayor prioridad (None si no queda ninguna)."""
+        heap = self.heap
+        if len(heap) > 2 * (len(self.position) - len(self.assigned)) + 64:
+            # Demasiadas entradas obsoletas: reconstruye el heap con las vigentes.
+            self.heap = heap = [e for e in heap
+                                if e[2] not in self.assigned and e[1] == self.version[e[2]]]
+            heapq.heapify(heap)
+        while heap:
+            _, version, var = heap[0]
+            if var in self.assigned or version != self.version[var]:
+                heapq.heappop(heap)  # Entrada obsoleta.
+                continue
+            return var
+        return None
+
+    def domains_changed(self, variables):
+        """Recalcula la prioridad de las variables sin asignar cuyo dominio cambió."""
+        for v in variables:
+            if v not in self.assigned:
+                self._push(v)
+
+    def pruned(self, var, removed, ok):
+        """
+        Tras propagar la asignación de `var`: actualiza las variables podadas y, si algún
+        dominio quedó vacío, cuenta un conflicto en la restricción entre `var` y esa variable.
+        """
+        if not ok:
+            if self.csp.conflict_arc is not None:
+                self.conflict(*self.csp.conflict_arc)  # Arco que vació el dominio en MAC.
+            else:
+                for v in removed:
+                    if self.csp.domain_size(v) == 0:
+                        self.conflict(var, v)
+        self.domains_changed(removed)
+
+    def conflict(self, x, y):
+        """Incrementa el peso de la restricción (x, y) y ajusta los wdeg afectados."""
+        if y not in self.weight[x]:
+            return
+        self.weight[x][y] += 1
+        self.weight[y][x] += 1
+        # wdeg[a] incluye w(a, b) solo mientras b esté sin asignar.
+        if y not in self.assigned:
+            self.wdeg[x] += 1
+            if x not in self.assigned:
+                self._push(x)
+        if x not in self.assigned:
+            self.wdeg[y] += 1
+            if y not in self.assigned:
+                self._push(y)
+
+    def on_assign(self, var):
+        """`var` pasa a estar asignada: deja de contar en el grado de sus vecinos."""
+        self.assigned.add(var)
+        self.version[var] += 1  # Invalida sus entradas del heap.
+        weight = self.weight[var]
+        for u in self.adj[var]:
+            self.degree[u] -= 1
+            self.wdeg[u] -= weight[u]
+            if u not in self.assigned:
+                self._push(u)
+
+    def on_unassign(self, var):
+        """`var` vuelve a estar libre: recupera su entrada y su peso en los vecinos."""
+        self.assigned.discard(var)
+        weight = self.weight[var]
+        for u in self.adj[var]:
+            self.degree[u] += 1
+            self.wdeg[u] += weight[u]
+            if u not in self.assigned:
+                self._push(u)
+        self._push(var)
+
+class SupportCounts:
+    """
+    Least Constraining Value con contadores de soporte incrementales.
+
+    count(x, a, y) es cuántos valores del dominio actual de `y` son compatibles con x = a.
+    LCV prueba primero el valor de `var` con más soportes en sus vecinos sin asignar, es
+    decir, el que menos valores les elimina.
+    Los contadores no se recalculan en cada nodo: para cada variable `y` se guarda un
+    vector `flat[y]` con count(x, a, y) de todos sus vecinos x (concatenados) y una matriz
+    de compatibilidad `compat[y]` (fila b = qué (x, a) son compatibles con y = b). Podar
+    los valores B de `y` es restar las filas B de la matriz; restaurarlos, sumarlas.
+    """
+    def __init__(self, csp):
+        self.csp = csp
+        self.adj = _constraint_graph(csp)
+        self.values = {v: csp.domain(v) for v in csp.variables}  # Dominios iniciales.
+        self.index = {v: {val: i for i, val in enumerate(self.values[v])} for v in csp.variables}
+        self.offset = {}  # y → {x: posición de los valores de x en flat[y]}.
+        self.compat = {}
+        self.flat = {}
+        constraints = csp.constraints
+        for y in csp.variables:
+            offsets, start = {}, 0
+            for x in self.adj[y]:
+                offsets[x] = start
+                start += len(self.values[x])
+            table = np.zeros((len(self.values[y]), start), dtype=np.int64)
+            for x, off in offsets.items():
+                if csp.tables is not None:
+                    # Reutiliza la tabla compilada, reordenada según los dominios actuales.
+                    rows = [csp.value_index[y][b] for b in self.values[y]]
+                    cols = [csp.value_index[x][a] for a in self.values[x]]
+                    table[:, off:off + len(cols)] = csp.tables[(y, x)][np.ix_(rows, cols)]
+                    continue
+                for j, b in enumerate(self.values[y]):
+                    for i, a in enumerate(self.values[x]):
+                        if constraints(x, a, y, b):
+                            table[j, off + i] = 1
+            self.offset[y] = offsets
+            self.compat[y] = table
+            self.flat[y] = table.sum(axis=0)  # Con el dominio completo de y.
+
+    def _lost_rows(self, y, saved):
+        """Índices de los valores de `y` podados en este nivel."""
+        index = self.index[y]
+        return [index[b] for b in self.csp.pruned_values(y, saved)]
+
+    def pruned(self, removed):
+        """Descuenta los soportes de los valores podados en este nivel."""
+        for y, saved in removed.items():
+            rows = self._lost_rows(y, saved)
+            if rows:
+                self.flat[y] -= self.compat[y][rows].sum(axis=0)
+
+    def restored(self, removed):
+        """Recupera los soportes de los valores que se van a restaurar."""
+        for y, saved in removed.items():
+            rows = self._lost_rows(y, saved)
+            if rows:
+                self.flat[y] += self.compat[y][rows].sum(axis=0)
+
+    def count(self, x, a, y):
+        """Soportes actuales de x = a en el dominio de `y`."""
+        return int(self.flat[y][self.offset[y][x] + self.index[x][a]])
+
+    def order(self, var, assignment):
+        """Valores de `var` de más a menos soportes en los vecinos sin asignar (LCV)."""
+        d = len(self.values[var])
+        scores = np.zeros(d, dtype=np.int64)
+        for y in self.adj[var]:
+            if y not in assignment:
+                off = self.offset[y][var]
+                scores += self.flat[y][off:off + d]
+        index = self.index[var]
+        # Orden estable: a igualdad de soportes se respeta el orden del dominio.
+        return sorted(self.csp.domain(var), key=lambda a: -scores[index[a]])
+
+if hasattr(int, 'bit_count'):  # Python >= 3.10 tiene popcount nativo.
+    _popcount = int.bit_count
+else:
+    def _popcount(mask):
+        """Número de bits a 1 de `mask` (tamaño de un dominio en modo bitset)."""
+        return bin(mask).count('1')
+
+class BitsetCSP(CSP):
+    """
+    CSP con dominios representados como máscaras de bits (un entero por variable).
+
+    El bit i de `masks[var]` indica si el i-ésimo valor del dominio original sigue
+    disponible. Los enteros de Python son de precisión arbitraria, así que sirve para
+    dominios finitos de cualquier tamaño. Con esta representación:
+    - la poda de Forward Checking es un AND con la máscara de soportes del valor asignado
+      (calculada una sola vez por (variable, valor, vecino) y cacheada),
+    - el tamaño del dominio es un popcount,
+    - y deshacer es reponer las máscaras guardadas en el trail del nivel (`removed`).
+    Los valores de los dominios deben ser hashables.
+    """
+    def __init__(self, variables, domains, neighbors, constraints, ordering=None,
+                 value_ordering=None, compiled=False, relation_key=None, inference='fc'):
+        super().__init__(variables, domains, neighbors, constraints, ordering, value_ordering,
+                         compiled, relation_key, inference)
+        # Índice de bit → valor y valor → índice de bit, por variable.
+        self.values = {v: list(self.domains[v]) for v in variables}
+        self.bit = {v: {val: i for i, val in enumerate(self.values[v])} for v in variables}
+        # Dominio actual: todos los bits a 1 al principio.
+        self.masks = {v: (1 << len(self.values[v])) - 1 for v in variables}
+        self._supports = {}  # (var, i, vecino) → máscara de valores del vecino compatibles.
+        # `consistent` solo mira el bit propio, así que la poda debe cubrir ambos sentidos
+        # de cada restricción aunque `neighbors` liste solo uno.
+        self._adj = _constraint_graph(self)
+
+    def domain(self, var):
+        """Valores que quedan en el dominio actual de `var`, en el orden original."""
+        mask = self.masks[var]
+        return [val for i, val in enumerate(self.values[var]) if mask >> i & 1]
+
+    def support_mask(self, var, i, nbr):
+        """Máscara de valores de `nbr` compatibles con `var` = i-ésimo valor (cacheada)."""
+        key = (var, i, nbr)
+        mask = self._supports.get(key)
+        if mask is None and self.tables is not None:
+            # La fila compilada empaquetada en bits es directamente la máscara de soportes.
+            row = self.tables[(var, nbr)][self.value_index[var][self.values[var][i]]]
+            mask = int.from_bytes(np.packbits(row, bitorder='little').tobytes(), 'little')
+            self._supports[key] = mask
+        if mask is None:
+            val = self.values[var][i]
+            mask = 0
+            for j, v2 in enumerate(self.values[nbr]):
+                if self.constraints(var, val, nbr, v2):
+                    mask |= 1 << j
+            self._supports[key] = mask
+        return mask
+
+    def consistent(self, var, val, assignment):
+        """
+        Con Forward Checking sobre el grafo simétrico, todo valor que sigue en la máscara es
+        compatible con los vecinos ya asignados, así que basta con mirar su bit.
+        """
+        return bool(self.masks[var] >> self.bit[var][val] & 1)
+
+    def forward_check(self, var, val, assignment, removed):
+        """
+        Forward Checking con AND de máscaras, sobre los vecinos del grafo simétrico. En
+        `removed` se guarda (solo la primera vez en este nivel) la máscara previa de cada
+        vecino podado, que es el trail para deshacer.
+        """
+        i = self.bit[var][val]
+        masks, supports = self.masks, self._supports
+        for nbr in self._adj[var]:
+            if nbr not in assignment:
+                old = masks[nbr]
+                support = supports.get((var, i, nbr))
+                if support is None:
+                    support = self.support_mask(var, i, nbr)
+                new = old & support
+                if new != old:
+                    removed.setdefault(nbr, old)  # Guarda la máscara previa al nivel.
+                    masks[nbr] = new
+                    if not new:  # Dominio vacío: no hay solución por esta rama.
+                        return False
+        return True
+
+    def revise(self, Xi, Xj, removed):
+        """Revise con máscaras: el valor i de Xi sobrevive si su máscara de soportes corta a Xj."""
+        mask = self.masks[Xi]
+        other = self.masks[Xj]
+        new, rest = mask, mask
+        while rest:
+            low = rest & -rest  # Bit más bajo aún por revisar.
+            rest ^= low
+            if not other & self.support_mask(Xi, low.bit_length() - 1, Xj):
+                new ^= low
+        if new == mask:
+            return False
+        removed.setdefault(Xi, mask)  # Guarda la máscara previa al nivel.
+        self.masks[Xi] = new
+        return True
+
+    def pruned_values(self, var, saved):
+        """Valores cuyo bit estaba en la máscara guardada y ya no está en la actual."""
+        lost = saved & ~self.masks[var]
+        return [val for i, val in enumerate(self.values[var]) if lost >> i & 1]
+
+    def restore(self, removed):
+        """Repone las máscaras guardadas en el trail del nivel."""
+        self.masks.update(removed)
+
+    def domain_size(self, var):
+        """Tamaño del dominio como popcount de la máscara."""
+        return _popcount(self.masks[var])
 
 # Ejemplo: coloreado de mapa de Australia (un problema CSP típico).
 if __name__ == "__main__":
@@ -144,3 +784,34 @@ if __name__ == "__main__":
             print(f"  {region}: {solution[region]}")
     else:
         print("No existe solución.")  # Si no se encuentra solución, indicar que no es posible.
+
+    # El mismo problema con dominios en máscaras de bits.
+    solution = BitsetCSP(variables, domains, neighbors, constraint).solve()
+    print("Solución (bitset):", solution)
+
+    # Con ordenación indexada dom/wdeg.
+    solution = BitsetCSP(variables, domains, neighbors, constraint, ordering='domwdeg').solve()
+    print("Solución (dom/wdeg):", solution)
+
+    # Con ordenación de valores LCV.
+    solution = CSP(variables, domains, neighbors, constraint, value_ordering='lcv').solve()
+    print("Solución (LCV):", solution)
+
+    # Con restricciones precompiladas: todas las aristas comparten la tabla "distinto".
+    solution = BitsetCSP(variables, domains, neighbors, constraint, ordering='mrv',
+                         compiled=True, relation_key=lambda a, b: 'distinto').solve()
+    print("Solución (tablas):", solution)
+
+    # Con MAC: AC-3 tras cada asignación.
+    solution = BitsetCSP(variables, domains, neighbors, constraint, inference='mac').solve()
+    print("Solución (MAC):", solution)
+
+    # Vecinos listados en un solo sentido: el modo bitset debe coincidir con el genérico.
+    one_sided = (['B', 'A'], {'A': [1, 2], 'B': [1]}, {'A': ['B'], 'B': []}, constraint)
+    print("Vecinos en un sentido (genérico):", CSP(*one_sided).solve())
+    print("Vecinos en un sentido (bitset):", BitsetCSP(*one_sided).solve())
+
+    # En paralelo: portfolio de resolutores y división de los primeros niveles del árbol.
+    csp = CSP(variables, domains, neighbors, constraint)
+    print("Solución (portfolio):", csp.solve_parallel(mode='portfolio', processes=2, seed=0))
+    print("Solución (split):", csp.solve_parallel(mode='split', processes=2, split_depth=2))
@@ -1,12 +1,48 @@
 from collections import deque
+import numpy as np  # Para las tablas de restricciones precompiladas.
+
+_MISSING = object()  # Marca de "sin soporte previo" en el trail.
+
+def compile_constraints(variables, domains, neighbors, constraints, relation_key=None):
+    """
+    Precompila cada restricción binaria en una matriz booleana de NumPy.
+
+    Retorna (index, tables), con index[v] = {valor: posición en el dominio de v} y
+    tables[(x, y)][i, j] = constraints(x, Dx[i], y, Dy[j]). El arco (y, x) reutiliza la
+    traspuesta de (x, y) (restricción simétrica), y los arcos con la misma
+    `relation_key(x, y)` y los mismos dominios comparten una única matriz.
+    """
+    index = {v: {val: i for i, val in enumerate(domains[v])} for v in variables}
+    tables = {}
+    cache = {}  # (clave de relación, dominio x, dominio y) → (T, T traspuesta).
+    for x in variables:
+        for y in neighbors[x]:
+            if (x, y) in tables:
+                continue
+            dx, dy = domains[x], domains[y]
+            key = (relation_key(x, y), tuple(dx), tuple(dy)) if relation_key is not None else None
+            pair = cache.get(key) if key is not None else None
+            if pair is None:
+                table = np.array([[bool(constraints(x, a, y, b)) for b in dy] for a in dx],
+                                 dtype=bool).reshape(len(dx), len(dy))
+                pair = (table, table.T)
+                if key is not None:
+                    cache[key] = pair
+            tables[(x, y)] = pair[0]
+            tables.setdefault((y, x), pair[1])
+    return index, tables
 
 class CSP:
     """
-    Problema de Satisfacción de Restricciones con propagación AC-3 (Arc-Consistency).
+    Problema de Satisfacción de Restricciones con propagación AC-3 (Arc-Consistency) o
+    AC-2001/AC-3.1 (AC-3 con último soporte recordado, de complejidad óptima O(e·d²)).
     """
-    def __init__(self, variables, domains, neighbors, constraints):
+    def __init__(self, variables, domains, neighbors, constraints, compiled=False, relation_key=None):
         """
         Inicializa el problema CSP con las variables, dominios, vecinos y restricciones.
+        Con `compiled=True` las restricciones se evalúan una vez en tablas booleanas
+        (`compile_constraints`, que comparte tablas entre arcos con la misma `relation_key`)
+        y `revise` trabaja con ellas de forma vectorizada.
         """
         self.variables = variables
         # Dominios es un diccionario que mapea cada variable a su lista de valores posibles.
@@ -15,42 +51,179 @@ class CSP:
         self.neighbors = neighbors
         # constraints es una función que verifica si una asignación (X=x, Y=y) cumple las restricciones entre dos variables.
         self.constraints = constraints
+        # Orden inicial de cada dominio y posición de cada valor en él (AC-2001 busca soportes
+        # siguiendo este orden, a partir del último encontrado).
+        self.initial = {v: list(self.domains[v]) for v in variables}
+        self.position = {v: {val: i for i, val in enumerate(self.initial[v])} for v in variables}
+        # Último soporte encontrado para cada (Xi, x, Xj).
+        self.last = {}
+        # Trail para deshacer sin copiar: entradas ('D', var, dominio previo) y
+        # ('S', (Xi, x, Xj), soporte previo); `levels` guarda la longitud del trail en cada nivel.
+        self.trail = []
+        self.levels = []
+        # Contadores para medir el trabajo de la propagación (acumulativos).
+        self.checks = 0      # Comprobaciones de restricción (llamadas o consultas a tabla).
+        self.revisions = 0   # Llamadas a revise.
+        # Tablas de compatibilidad precompiladas (o None si se usan llamadas a `constraints`).
+        self.tables = None
+        if compiled:
+            self.value_index, self.tables = compile_constraints(
+                variables, self.domains, neighbors, constraints, relation_key)
+
+    def _set_domain(self, var, values):
+        """Sustituye el dominio de `var` (sin mutar la lista anterior) y lo anota en el trail."""
+        if self.levels:
+            self.trail.append(('D', var, self.domains[var]))
+        self.domains[var] = values
+
+    def _set_support(self, key, y):
+        """Actualiza el último soporte de `key` y lo anota en el trail."""
+        if self.levels:
+            self.trail.append(('S', key, self.last.get(key, _MISSING)))
+        self.last[key] = y
+
+    def push_level(self):
+        """Abre un nivel: todo lo que se cambie a partir de aquí se podrá deshacer con `pop_level`."""
+        self.levels.append(len(self.trail))
+
+    def pop_level(self):
+        """Deshace los dominios y soportes modificados desde el último `push_level`."""
+        mark = self.levels.pop()
+        trail = self.trail
+        while len(trail) > mark:
+            kind, key, old = trail.pop()
+            if kind == 'D':
+                self.domains[key] = old
+            elif old is _MISSING:
+                del self.last[key]
+            else:
+                self.last[key] = old
+
+    def assign(self, var, value):
+        """
+        Reduce el dominio de `var` a `value` y propaga. Retorna False si hay un dominio vacío.
+        Lanza ValueError, sin cambiar nada, si `value` no está en el dominio actual de `var`.
+        """
+        if value not in self.domains[var]:
+            raise ValueError(f"{value!r} no está en el dominio actual de {var!r}")
+        self._set_domain(var, [value])
+        return self.propagate([var])
+
+    def check(self, Xi, x, Xj, y):
+        """Comprueba la restricción entre (Xi, x) y (Xj, y), contándola en `checks`."""
+        self.checks += 1
+        if self.tables is not None:
+            return bool(self.tables[(Xi, Xj)][self.value_index[Xi][x], self.value_index[Xj][y]])
+        return self.constraints(Xi, x, Xj, y)
 
     def revise(self, Xi, Xj):
         """
         Revisa y elimina valores del dominio de Xi que no tienen soporte en Xj.
         Retorna True si se eliminó algún valor.
         """
-        revised = False
+        self.revisions += 1
+        if self.tables is not None:
+            # Versión compilada: submatriz (valores de Xi) × (valores de Xj) y un `any` por fila.
+            Di, Dj = self.domains[Xi], self.domains[Xj]
+            ii, ij = self.value_index[Xi], self.value_index[Xj]
+            sub = self.tables[(Xi, Xj)][np.ix_([ii[x] for x in Di], [ij[y] for y in Dj])]
+            self.checks += sub.size
+            supported = sub.any(axis=1)
+            if supported.all():
+                return False
+            self._set_domain(Xi, [x for x, ok in zip(Di, supported) if ok])
+            return True
+        keep = []
         # Recorre todos los valores del dominio de Xi
-        for x in self.domains[Xi][:]:  # Usamos [:] para hacer una copia y evitar modificar la lista mientras iteramos
-            # Si no existe ningún valor y en el dominio de Xj que satisfaga la restricción entre (Xi, x) y (Xj, y)
-            if not any(self.constraints(Xi, x, Xj, y) for y in self.domains[Xj]):
-                # Si no se encontró ningún valor válido, eliminamos x del dominio de Xi
-                self.domains[Xi].remove(x)
-                revised = True
-        return revised
-
-    def ac3(self):
+        for x in self.domains[Xi]:
+            # Se conserva x si existe algún valor y en el dominio de Xj que satisfaga la restricción entre (Xi, x) y (Xj, y)
+            if any(self.check(Xi, x, Xj, y) for y in self.domains[Xj]):
+                keep.append(x)
+        if len(keep) == len(self.domains[Xi]):
+            return False
+        # Se construye una lista nueva en lugar de borrar de la actual, para que el trail pueda
+        # guardar la anterior sin copiarla.
+        self._set_domain(Xi, keep)
+        return True
+
+    def revise2001(self, Xi, Xj):
+        """
+        Revise de AC-2001/AC-3.1: para cada valor x de Xi se comprueba primero si su último
+        soporte en Xj sigue en el dominio; solo si no, se busca uno nuevo a partir de esa
+        posición (los anteriores ya fallaron y los dominios solo decrecen).
+        Retorna True si se eliminó algún valor.
+        """
+        self.revisions += 1
+        present = set(self.domains[Xj])  # Pertenencia en O(1) al dominio actual de Xj.
+        initial, position, last = self.initial[Xj], self.position[Xj], self.last
+        keep = []
+        for x in self.domains[Xi]:
+            key = (Xi, x, Xj)
+            start = 0
+            if key in last:
+                y = last[key]
+                if y in present:
+                    keep.append(x)  # El soporte anterior sigue valiendo: ninguna comprobación.
+                    continue
+                start = position[y] + 1
+            for k in range(start, len(initial)):
+                y = initial[k]
+                if y in present and self.check(Xi, x, Xj, y):
+                    if last.get(key, _MISSING) != y:
+                        self._set_support(key, y)
+                    keep.append(x)
+                    break
+        if len(keep) == len(self.domains[Xi]):
+            return False
+        self._set_domain(Xi, keep)
+        return True
+
+    def ac3(self, algorithm='ac2001'):
         """
         Aplica el algoritmo AC-3 para lograr consistencia de arcos en todos los pares de variables.
+        Con algorithm='ac2001' (por defecto) se usa `revise2001`, que recuerda el último soporte
+        de cada valor; con 'ac3', el `revise` clásico. Ambos alcanzan los mismos dominios.
+        La cola nunca contiene arcos repetidos.
         Retorna False si algún dominio queda vacío, True si AC-3 completó exitosamente.
         """
         # Cola de arcos (Xi, Xj), donde Xi es una variable y Xj es su vecino
         queue = deque((Xi, Xj) for Xi in self.variables for Xj in self.neighbors[Xi])
+        return self._run_queue(queue, algorithm)
+
+    def propagate(self, changed_vars, algorithm='ac2001'):
+        """
+        Propagación incremental: solo encola los arcos (Xk, Xj) que apuntan a las variables
+        de `changed_vars` (cuyo dominio acaba de cambiar) y continúa como AC-3 desde ahí.
+        Dentro de un `push_level()` los cambios quedan en el trail y `pop_level()` los deshace,
+        sin tener que copiar el CSP para explorar alternativas.
+        Retorna False si algún dominio queda vacío.
+        """
+        queue = deque()
+        for Xj in changed_vars:
+            for Xk in self.neighbors[Xj]:
+                queue.append((Xk, Xj))
+        return self._run_queue(queue, algorithm)
+
+    def _run_queue(self, queue, algorithm):
+        """Bucle común de `ac3` y `propagate` sobre una cola inicial de arcos."""
+        revise = self.revise2001 if algorithm == 'ac2001' else self.revise
+        queue = deque(dict.fromkeys(queue))  # Sin duplicados, conservando el orden.
+        queued = set(queue)  # Arcos que están ahora mismo en la cola.
 
         # Procesamos la cola mientras haya arcos por revisar
         while queue:
             Xi, Xj = queue.popleft()  # Extraemos el siguiente arco (Xi, Xj)
+            queued.discard((Xi, Xj))
             # Si se han eliminado valores en el dominio de Xi, revisamos los arcos relacionados con Xi
-            if self.revise(Xi, Xj):
+            if revise(Xi, Xj):
                 # Si el dominio de Xi queda vacío, no se puede continuar con el algoritmo (no hay solución)
                 if not self.domains[Xi]:
                     return False
                 # Añadimos los arcos relacionados con Xi a la cola, excepto el arco hacia Xj
                 for Xk in self.neighbors[Xi]:
-                    if Xk != Xj:
+                    if Xk != Xj and (Xk, Xi) not in queued:
                         queue.append((Xk, Xi))  # Agregamos el arco (Xk, Xi) para revisar su consistencia
+                        queued.add((Xk, Xi))
         return True
 
     def is_solved(self):
@@ -103,3 +276,29 @@ if __name__ == "__main__":
     else:
         # Si algún dominio quedó vacío, no hay solución posible
         print("Dominio vacío detectado - no hay solución.")
+
+    # La misma propagación con la restricción "distinto" compilada en una única tabla compartida.
+    compiled = CSP(variables, domains, neighbors, constraint, compiled=True,
+                   relation_key=lambda a, b: 'distinto')
+    print("AC-3 con tablas compiladas:", compiled.ac3(), compiled.domains == csp.domains)
+
+    # Comparación del trabajo de AC-3 clásico y AC-2001 en una cadena x0 < x1 < ... < x9,
+    # donde la poda se propaga de un extremo a otro muchas veces.
+    chain = list(range(10))
+    chain_domains = {v: list(range(30)) for v in chain}
+    chain_neighbors = {v: [u for u in (v - 1, v + 1) if 0 <= u < len(chain)] for v in chain}
+
+    def less_than(a, va, b, vb):
+        return va < vb if a < b else va > vb  # La variable de menor índice toma el valor menor
+
+    for algorithm in ('ac3', 'ac2001'):
+        other = CSP(chain, chain_domains, chain_neighbors, less_than)
+        other.ac3(algorithm)
+        print(f"{algorithm}: {other.checks} comprobaciones, {other.revisions} revisiones")
+
+    # Uso incremental (p. ej. un configurador): probar una elección y deshacerla sin copiar.
+    csp.push_level()
+    ok = csp.assign('SA', 'red')
+    print("Con SA = red:", ok, {v: csp.domains[v] for v in ['WA', 'NT', 'SA']})
+    csp.pop_level()
+    print("Tras pop_level:", {v: csp.domains[v] for v in ['WA', 'NT', 'SA']})
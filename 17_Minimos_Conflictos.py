@@ -1,4 +1,34 @@
 import random  # Importa el módulo random para elegir valores aleatorios
+import numpy as np  # Importa numpy para las tablas de restricciones precompiladas
+
+def compile_constraints(variables, domains, neighbors, constraints, relation_key=None):
+    """
+    Precompila cada restricción binaria en una matriz booleana de NumPy.
+
+    Retorna (index, tables), con index[v] = {valor: posición en el dominio de v} y
+    tables[(x, y)][i, j] = constraints(x, Dx[i], y, Dy[j]). El arco (y, x) reutiliza la
+    traspuesta de (x, y) (restricción simétrica), y los arcos con la misma
+    `relation_key(x, y)` y los mismos dominios comparten una única matriz.
+    """
+    index = {v: {val: i for i, val in enumerate(domains[v])} for v in variables}
+    tables = {}
+    cache = {}  # (clave de relación, dominio x, dominio y) → (T, T traspuesta).
+    for x in variables:
+        for y in neighbors[x]:
+            if (x, y) in tables:
+                continue
+            dx, dy = domains[x], domains[y]
+            key = (relation_key(x, y), tuple(dx), tuple(dy)) if relation_key is not None else None
+            pair = cache.get(key) if key is not None else None
+            if pair is None:
+                table = np.array([[bool(constraints(x, a, y, b)) for b in dy] for a in dx],
+                                 dtype=bool).reshape(len(dx), len(dy))
+                pair = (table, table.T)
+                if key is not None:
+                    cache[key] = pair
+            tables[(x, y)] = pair[0]
+            tables.setdefault((y, x), pair[1])
+    return index, tables
 
 class CSP:
     """
@@ -7,8 +37,10 @@ class CSP:
     - domains: dict var -> lista de valores posibles
     - neighbors: dict var -> lista de variables con las que tiene restricciones
     - constraints: función(var1, val1, var2, val2) -> bool
+    - compiled: si es True, precompila las restricciones en tablas booleanas
+    - relation_key: función(var1, var2) -> clave para compartir tablas entre arcos
     """
-    def __init__(self, variables, domains, neighbors, constraints):
+    def __init__(self, variables, domains, neighbors, constraints, compiled=False, relation_key=None):
         # Inicializa el CSP con las variables, dominios, vecinos y restricciones
         self.variables = variables  # Lista de variables (por ejemplo, las columnas de un tablero de N reinas)
         # Crea un diccionario de dominios, donde para cada variable (columna), se asigna una lista de posibles valores (filas)
@@ -17,11 +49,28 @@ class CSP:
         self.neighbors = neighbors
         # La función constraints define las restricciones entre las variables (por ejemplo, no pueden estar en la misma fila o diagonal)
         self.constraints = constraints
+        # Tablas de compatibilidad precompiladas (None si se llama directamente a `constraints`)
+        self.tables = None
+        if compiled:
+            self.value_index, self.tables = compile_constraints(
+                variables, self.domains, neighbors, constraints, relation_key)
+            # Filas como listas de Python para las consultas escalares (una copia por tabla distinta)
+            lists = {}
+            self._rows = {}
+            for arc, t in self.tables.items():
+                if id(t) not in lists:
+                    lists[id(t)] = t.tolist()
+                self._rows[arc] = lists[id(t)]
 
     def conflict_count(self, var, val, assignment):
         """
         Cuenta el número de conflictos si var = val dado assignment parcial.
         """
+        if self.tables is not None:
+            # Versión compilada: consulta la tabla en lugar de llamar a la función de restricción
+            index, rows, i = self.value_index, self._rows, self.value_index[var][val]
+            return sum(1 for nbr in self.neighbors[var]
+                       if nbr in assignment and not rows[(var, nbr)][i][index[nbr][assignment[nbr]]])
         count = 0  # Inicializa el contador de conflictos en 0
         # Recorre todos los vecinos de la variable actual
         for nbr in self.neighbors[var]:
@@ -30,6 +79,18 @@ class CSP:
                 count += 1
         return count  # Devuelve el número total de conflictos
 
+    def conflict_counts(self, var, assignment):
+        """
+        Conflictos de cada valor del dominio de `var` a la vez (requiere tablas compiladas):
+        suma, para cada vecino asignado, la columna de su valor negada.
+        """
+        index = self.value_index
+        counts = np.zeros(len(self.domains[var]), dtype=np.int64)
+        for nbr in self.neighbors[var]:
+            if nbr in assignment:
+                counts += ~self.tables[(var, nbr)][:, index[nbr][assignment[nbr]]]
+        return counts
+
 def min_conflicts(csp, max_steps=10000):
     """
     Algoritmo de Min-Conflicts para CSP.
@@ -53,6 +114,13 @@ def min_conflicts(csp, max_steps=10000):
 
         # Elegir el valor para la variable que minimiza los conflictos
         domain = csp.domains[var]  # Obtiene los posibles valores (dominio) para la variable
+        if csp.tables is not None:
+            # Con tablas compiladas se cuentan los conflictos de todos los valores de una vez
+            counts = csp.conflict_counts(var, assignment)
+            best = np.flatnonzero(counts == counts.min())
+            assignment[var] = domain[random.choice(best)]
+            continue
+
         # Inicializa la lista de valores que minimizan los conflictos y el conteo mínimo de conflictos
         conflict_vals = []
         min_conf = float('inf')  # Usa infinito como valor inicial para encontrar el mínimo
@@ -101,3 +169,9 @@ if __name__ == "__main__":
             print(line)
     else:
         print("No se encontró solución en el límite de pasos.")  # Si no hay solución, imprimir mensaje
+
+    # Variante con restricciones precompiladas: la relación solo depende de la distancia
+    # entre columnas, así que basta una tabla por distancia
+    compiled = CSP(variables, domains, neighbors, queens_constraint, compiled=True,
+                   relation_key=lambda c1, c2: abs(c1 - c2))
+    print("Min-Conflicts con tablas:", min_conflicts(compiled, max_steps=10000))